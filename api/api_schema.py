@@ -1,8 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_serializer
 
 
 class UserRole(str, Enum):
@@ -10,6 +10,11 @@ class UserRole(str, Enum):
     admin = "admin"
 
 
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
 class RequestBody(BaseModel):
     author: str
     title: str
@@ -22,6 +27,17 @@ class Content(BaseModel):
     title: str
     content: str
     created_at: datetime
+    # include 옵션으로 요청한 경우에만 채워서 응답
+    comments: Optional[List["CommentContent"]] = None
+    comment_count: Optional[int] = None
+
+    @model_serializer(mode="wrap")
+    def _exclude_not_included(self, handler):
+        data = handler(self)
+        for name in ("comments", "comment_count"):
+            if data.get(name) is None:
+                data.pop(name, None)
+        return data
 
 
 class ResponseModel(BaseModel):
@@ -29,15 +45,43 @@ class ResponseModel(BaseModel):
     data: Content
 
 
+class BatchIds(BaseModel):
+    ids: List[int]
+
+
+class ResponseBatchModel(BaseModel):
+    message: str = Field(example="성공")
+    data: List[Optional[Content]]
+    missing: List[int]
+
+
+class ResponseTitles(BaseModel):
+    message: str = Field(example="성공")
+    data: List[str]
+
+
 class ResponseListModel(BaseModel):
     message: str = Field(example="성공")
     data: List[Content]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
 
 
 class ResponseMessageModel(BaseModel):
     message: str = Field(example="성공")
 
 
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class ResponseBulkModel(BaseModel):
+    message: str = Field(example="성공")
+    created: int
+    errors: List[BulkError]
+
+
 class UserBody(BaseModel):
     password: str
     nickname: str
@@ -62,6 +106,9 @@ class CommentContent(BaseModel):
     created_at: datetime
 
 
+Content.model_rebuild()
+
+
 class CommentBody(BaseModel):
     author_id: str
     post_id: int = 1
@@ -80,6 +127,8 @@ class ResponseComment(BaseModel):
 class ResponseComList(BaseModel):
     message: str = Field(example="성공")
     data: List[CommentContent]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
 
 
 class ResponseAccessToken(BaseModel):
@@ -90,3 +139,8 @@ class ResponseAccessToken(BaseModel):
 class Login(BaseModel):
     user_id: str
     password: str
+
+
+class AuthUser(BaseModel):
+    user_id: str
+    role: str
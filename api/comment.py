@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from api.api_schema import (
+    AuthUser,
+    BulkError,
     CommentBody,
     CommentConent,
+    ResponseBulkModel,
     ResponseComment,
     ResponseMessageModel,
 )
-from common import api_key_header, decode_access_token
-from database import Comment, Post, User, engine
-
-session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+from auth import get_current_user
+from cache import invalidate, post_comments_key
+from common import (
+    chunked,
+    find_existing,
+    parse_bulk_body,
+    settings,
+    validate_bulk_items,
+)
+from counter import add_counts, post_comment_counter, user_comment_counter
+from database import Comment, Post, User, get_session
 
-router = APIRouter(prefix="/api/comments", tags=["comments"])
+router = APIRouter(
+    prefix="/api/comments", tags=["comments"], default_response_class=ORJSONResponse
+)
 
 
 @router.post(
@@ -21,7 +36,9 @@ router = APIRouter(prefix="/api/comments", tags=["comments"])
     response_model=ResponseMessageModel,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_comment(data: CommentBody) -> ResponseMessageModel:
+async def create_comment(
+    data: CommentBody, session: AsyncSession = Depends(get_session)
+) -> ResponseMessageModel:
     """
     댓글 생성
     """
@@ -35,17 +52,94 @@ async def create_comment(data: CommentBody) -> ResponseMessageModel:
         author_id=data.author_id, post_id=data.post_id, content=data.content
     )
     session.add(comment)
+    await add_counts(
+        session,
+        {
+            post_comment_counter(data.post_id): 1,
+            user_comment_counter(data.author_id): 1,
+        },
+    )
     await session.commit()
+    await invalidate(post_comments_key(data.post_id))
     return ResponseMessageModel(message="댓글 생성 성공")
 
 
+@router.post(
+    "/bulk",
+    response_model=ResponseBulkModel,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_comments_bulk(
+    request: Request,
+    chunk_size: int = Query(default=settings.bulk_chunk_size, ge=1, le=10000),
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> ResponseBulkModel:
+    """
+    댓글 대량 생성 (JSON 배열 혹은 NDJSON 본문)
+    항목별로 검증하고, 게시글/작성자 존재 여부는 IN 쿼리로 한 번에 확인
+    통과한 항목을 chunk_size 개씩 multi-row INSERT 후 한 번에 커밋
+    본인 작성 댓글만 생성 가능 (관리자는 모든 작성자)
+    """
+    items, errors = await parse_bulk_body(request)
+    valid = validate_bulk_items(items, CommentBody, errors)
+    existing_post_ids = await find_existing(
+        session, Post.post_id, [data.post_id for _, data in valid], chunk_size
+    )
+    # 관리자는 다른 작성자로 생성할 수 있으므로 작성자도 확인 (없으면 INSERT 시 외래 키 오류)
+    existing_authors = await find_existing(
+        session, User.user_id, [data.author_id for _, data in valid], chunk_size
+    )
+    rows = []
+    for index, data in valid:
+        if current_user.role != "admin" and current_user.user_id != data.author_id:
+            errors.append(BulkError(index=index, detail="유저 아이디가 다릅니다."))
+            continue
+        if data.author_id not in existing_authors:
+            errors.append(
+                BulkError(index=index, detail="유저 아이디가 존재하지 않습니다.")
+            )
+            continue
+        if data.post_id not in existing_post_ids:
+            errors.append(BulkError(index=index, detail="게시물이 존재하지 않습니다."))
+            continue
+        rows.append(
+            {
+                "author_id": data.author_id,
+                "post_id": data.post_id,
+                "content": data.content,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+    deltas = {}
+    for row in rows:
+        for counter in (
+            post_comment_counter(row["post_id"]),
+            user_comment_counter(row["author_id"]),
+        ):
+            deltas[counter] = deltas.get(counter, 0) + 1
+    for chunk in chunked(rows, chunk_size):
+        await session.execute(insert(Comment), chunk)
+    await add_counts(session, deltas)
+    await session.commit()
+    if rows:
+        await invalidate(*{post_comments_key(row["post_id"]) for row in rows})
+    errors.sort(key=lambda error: error.index)
+    return ResponseBulkModel(
+        message=f"댓글 {len(rows)}개 생성 성공", created=len(rows), errors=errors
+    )
+
+
 @router.put(
     "/{com_id}",
     response_model=ResponseComment,
     status_code=status.HTTP_200_OK,
 )
 async def edit_comment(
-    com_id: int, data: CommentConent, token: str = Depends(api_key_header)
+    com_id: int,
+    data: CommentConent,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseComment:
     """
     댓글 내용 수정
@@ -56,9 +150,7 @@ async def edit_comment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="댓글이 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if user_content.role != "admin" and token_user_id.get("user_id") != res.author_id:
+    if current_user.role != "admin" and current_user.user_id != res.author_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
@@ -66,8 +158,9 @@ async def edit_comment(
     res.content = data.content
     session.add(res)
     await session.commit()
-    session.refresh(res)
-    data = await session.get(Comment, com_id)
+    await invalidate(post_comments_key(res.post_id))
+    await session.refresh(res)
+    data = res
     return ResponseComment(
         message=f"댓글 아이디 {com_id} 내용 수정 성공",
         data=CommentConent(
@@ -82,7 +175,9 @@ async def edit_comment(
     status_code=status.HTTP_200_OK,
 )
 async def delete_comment(
-    com_id: int, token: str = Depends(api_key_header)
+    com_id: int,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseMessageModel:
     """
     댓글 삭제
@@ -93,13 +188,19 @@ async def delete_comment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="댓글이 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if user_content.role != "admin" and token_user_id.get("user_id") != data.author_id:
+    if current_user.role != "admin" and current_user.user_id != data.author_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
-    session.delete(data)
+    await session.delete(data)
+    await add_counts(
+        session,
+        {
+            post_comment_counter(data.post_id): -1,
+            user_comment_counter(data.author_id): -1,
+        },
+    )
     await session.commit()
+    await invalidate(post_comments_key(data.post_id))
     return ResponseMessageModel(message=f"댓글 아이디 {com_id} 삭제 성공")
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncGenerator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+
+from api.api_schema import AuthUser, ExportFormat
+from auth import get_current_user
+from common import settings
+from database import Comment, Post, async_session
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+async def stream_rows(statement, format: ExportFormat) -> AsyncGenerator[str, None]:
+    """
+    서버 측 커서로 export_chunk_size 행씩 읽어서 바로 응답으로 전송
+    ORM 객체 대신 컬럼 값만 조회해서 테이블 크기와 관계없이 메모리 사용량 일정
+    응답 전송 중에도 사용할 수 있도록 요청 세션과 별도 세션 사용
+    """
+    statement = statement.execution_options(yield_per=settings.export_chunk_size)
+    async with async_session() as session:
+        result = await session.stream(statement)
+        columns = list(result.keys())
+        if format == ExportFormat.csv:
+            yield ",".join(columns) + "\r\n"
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                values = [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in row
+                ]
+                if format == ExportFormat.csv:
+                    writer.writerow(values)
+                else:
+                    buffer.write(
+                        json.dumps(dict(zip(columns, values)), ensure_ascii=False)
+                    )
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+
+def export_response(statement, format: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(statement, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+
+def check_admin(current_user: AuthUser) -> None:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 내보내기를 사용할 수 있습니다.",
+        )
+
+
+@router.get(
+    "/posts",
+    status_code=status.HTTP_200_OK,
+)
+async def export_posts(
+    format: ExportFormat = ExportFormat.ndjson,
+    author: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user: AuthUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    게시글 전체 내보내기 (NDJSON, CSV)
+    작성자, 작성일 범위(created_from 이상, created_to 미만)로 필터링
+    """
+    check_admin(current_user)
+    statement = select(
+        Post.post_id, Post.author, Post.title, Post.content, Post.created_at
+    ).order_by(Post.post_id)
+    if author is not None:
+        statement = statement.where(Post.author == author)
+    if created_from is not None:
+        statement = statement.where(Post.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Post.created_at < created_to)
+    return export_response(statement, format, "posts")
+
+
+@router.get(
+    "/comments",
+    status_code=status.HTTP_200_OK,
+)
+async def export_comments(
+    format: ExportFormat = ExportFormat.ndjson,
+    author_id: Optional[str] = None,
+    post_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user: AuthUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    댓글 전체 내보내기 (NDJSON, CSV)
+    작성자, 게시글, 작성일 범위(created_from 이상, created_to 미만)로 필터링
+    """
+    check_admin(current_user)
+    statement = select(
+        Comment.com_id,
+        Comment.author_id,
+        Comment.post_id,
+        Comment.content,
+        Comment.created_at,
+    ).order_by(Comment.com_id)
+    if author_id is not None:
+        statement = statement.where(Comment.author_id == author_id)
+    if post_id is not None:
+        statement = statement.where(Comment.post_id == post_id)
+    if created_from is not None:
+        statement = statement.where(Comment.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Comment.created_at < created_to)
+    return export_response(statement, format, "comments")
@@ -1,25 +1,79 @@
 from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+import autocomplete
 from api.api_schema import (
-    CommentContent,
+    AuthUser,
+    BatchIds,
+    BulkError,
     Content,
     RequestBody,
+    ResponseBatchModel,
+    ResponseBulkModel,
     ResponseComList,
     ResponseListModel,
     ResponseMessageModel,
     ResponseModel,
+    ResponseTitles,
 )
-from common import api_key_header, decode_access_token
-from database import Comment, Post, User, engine
+from auth import get_current_user
+from cache import (
+    POST_LIST_KEY,
+    get_or_load_entry,
+    get_or_load_many,
+    invalidate,
+    page_field,
+    post_comments_key,
+    post_key,
+)
+from common import (
+    PAGE_SIZE,
+    chunked,
+    dump_json,
+    dump_list,
+    encode_cursor,
+    find_existing,
+    next_cursor,
+    paginate,
+    parse_bulk_body,
+    parse_fields,
+    pick_fields,
+    select_columns,
+    settings,
+    validate_bulk_items,
+    wrap_data,
+)
+from counter import (
+    add_counts,
+    get_counts,
+    post_comment_counter,
+    user_post_counter,
+)
+from database import (
+    COMMENT_COLUMNS,
+    POST_COLUMNS,
+    Comment,
+    Post,
+    User,
+    async_session,
+    get_session,
+)
+from responses import conditional_response
+from search import search_statement
 
-session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+router = APIRouter(
+    prefix="/api/posts", tags=["posts"], default_response_class=ORJSONResponse
+)
 
-router = APIRouter(prefix="/api/posts", tags=["posts"])
+# 게시글 조회 시 include 옵션으로 함께 받을 수 있는 항목
+POST_INCLUDES = {"comments", "comment_count"}
 
 
 @router.post(
@@ -28,37 +82,166 @@ router = APIRouter(prefix="/api/posts", tags=["posts"])
     status_code=status.HTTP_201_CREATED,
 )
 async def create_post(
-    data: RequestBody, token: str = Depends(api_key_header)
+    data: RequestBody,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseMessageModel:
     """
     게시글 생성
     """
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if user_content.user_id != data.author:
+    if current_user.user_id != data.author:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
     post = Post(author=data.author, title=data.title, content=data.content)
     session.add(post)
+    await add_counts(session, {user_post_counter(data.author): 1})
     await session.commit()
+    await invalidate(POST_LIST_KEY)
+    await autocomplete.update_titles([(post.post_id, post.title)])
     return ResponseMessageModel(message="게시글 생성 성공")
 
 
+@router.post(
+    "/bulk",
+    response_model=ResponseBulkModel,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_posts_bulk(
+    request: Request,
+    chunk_size: int = Query(default=settings.bulk_chunk_size, ge=1, le=10000),
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> ResponseBulkModel:
+    """
+    게시글 대량 생성 (JSON 배열 혹은 NDJSON 본문)
+    항목별로 검증하고, 통과한 항목을 chunk_size 개씩 multi-row INSERT 후 한 번에 커밋
+    본인 작성 게시글만 생성 가능 (관리자는 모든 작성자)
+    """
+    items, errors = await parse_bulk_body(request)
+    valid = validate_bulk_items(items, RequestBody, errors)
+    # 없는 작성자는 INSERT 시 외래 키 오류로 전체가 실패하므로 항목별 오류로 처리
+    existing_authors = await find_existing(
+        session, User.user_id, [data.author for _, data in valid], chunk_size
+    )
+    rows = []
+    for index, data in valid:
+        if current_user.role != "admin" and current_user.user_id != data.author:
+            errors.append(BulkError(index=index, detail="유저 아이디가 다릅니다."))
+            continue
+        if data.author not in existing_authors:
+            errors.append(
+                BulkError(index=index, detail="유저 아이디가 존재하지 않습니다.")
+            )
+            continue
+        rows.append(
+            {
+                "author": data.author,
+                "title": data.title,
+                "content": data.content,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+    deltas = {}
+    for row in rows:
+        counter = user_post_counter(row["author"])
+        deltas[counter] = deltas.get(counter, 0) + 1
+    # INSERT ... RETURNING을 지원하는 DB는 생성된 게시글 번호로 자동완성 색인 갱신
+    returning = session.bind.dialect.insert_executemany_returning
+    titles = []
+    for chunk in chunked(rows, chunk_size):
+        if returning:
+            statement = insert(Post).returning(Post.post_id, Post.title)
+            titles.extend((await session.execute(statement, chunk)).all())
+        else:
+            await session.execute(insert(Post), chunk)
+    await add_counts(session, deltas)
+    await session.commit()
+    if rows:
+        await invalidate(POST_LIST_KEY)
+        if returning:
+            await autocomplete.update_titles([tuple(title) for title in titles])
+        else:
+            await autocomplete.rebuild_everywhere()
+    errors.sort(key=lambda error: error.index)
+    return ResponseBulkModel(
+        message=f"게시글 {len(rows)}개 생성 성공", created=len(rows), errors=errors
+    )
+
+
 @router.get(
     "/",
     response_model=ResponseListModel,
     status_code=status.HTTP_200_OK,
 )
-async def get_posts(page: int = 1) -> ResponseListModel:
+async def get_posts(
+    request: Request,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    include: Optional[str] = Query(default=None, example="comments,comment_count"),
+    fields: Optional[str] = Query(default=None, example="post_id,title"),
+) -> Response:
     """
     게시글 목록 조회
+    cursor 값이 있으면 page 대신 커서 기준으로 다음 페이지 조회
+    include 값이 있으면 목록 전체의 댓글/댓글 수를 쿼리 한 번씩으로 함께 조회
+    fields 값이 있으면 해당 컬럼만 조회해서 응답 (필드 조합별로 따로 캐시)
+    ETag/Last-Modified가 요청 헤더와 일치하면 304 응답
+    """
+    includes = parse_include(include)
+    fields = parse_fields(fields, POST_COLUMNS)
+    # include는 게시글 번호로 조회하므로 요청하지 않았어도 함께 조회
+    load_fields = fields
+    if includes and fields is not None and "post_id" not in fields:
+        load_fields = ["post_id", *fields]
+
+    async def load_posts() -> bytes:
+        columns = select_columns(POST_COLUMNS, load_fields, "post_id", "created_at")
+        statement = paginate(
+            select(*columns), Post.created_at, Post.post_id, page, cursor
+        )
+        async with async_session() as session:
+            results = (await session.exec(statement)).all()
+        return dump_list(
+            "게시글 목록 조회 성공",
+            results,
+            load_fields,
+            next_cursor=next_cursor(results, "post_id"),
+        )
+
+    raw, loaded_at = await get_or_load_entry(
+        POST_LIST_KEY, load_posts, page_field(page, cursor, load_fields)
+    )
+    if not includes:
+        return conditional_response(request, raw, loaded_at)
+    # 댓글은 목록 캐시와 따로 바뀌므로 Last-Modified 없이 ETag만 사용
+    result = orjson.loads(raw)
+    await attach_includes(result["data"], includes)
+    if fields is not None:
+        names = fields + sorted(includes)
+        result["data"] = [pick_fields(post, names) for post in result["data"]]
+    return conditional_response(request, dump_json(result))
+
+
+@router.get(
+    "/search",
+    response_model=ResponseListModel,
+    status_code=status.HTTP_200_OK,
+)
+async def search_posts(
+    q: str = Query(min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+) -> ResponseListModel:
     """
+    게시글 제목/내용 검색 (관련도 순)
+    cursor 값이 있으면 커서 기준으로 다음 페이지 조회
+    """
+    statement = search_statement(session.bind.dialect.name, q, cursor)
+    results = (await session.exec(statement)).all()
     data = []
-    offset = (page - 1) * 100
-    results = await session.exec(select(Post).offset(offset).limit(100)).all()
-    for res in results:
+    for res, _ in results:
         res_dict = Content(
             post_id=res.post_id,
             author=res.author,
@@ -67,7 +250,165 @@ async def get_posts(page: int = 1) -> ResponseListModel:
             created_at=res.created_at,
         )
         data.append(res_dict)
-    return ResponseListModel(message="게시글 목록 조회 성공", data=data)
+    cursor = None
+    if len(results) == PAGE_SIZE:
+        last, rank = results[-1]
+        cursor = encode_cursor((rank, last.post_id))
+    return ResponseListModel(
+        message="게시글 검색 성공",
+        data=data,
+        next_cursor=cursor,
+    )
+
+
+@router.get(
+    "/autocomplete",
+    response_model=ResponseTitles,
+    status_code=status.HTTP_200_OK,
+)
+async def autocomplete_titles(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> ResponseTitles:
+    """
+    게시글 제목 자동완성 (접두사 일치, 사전 순)
+    DB 조회 없이 워커 메모리 색인에서 조회
+    """
+    if not autocomplete.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="제목 색인을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+        )
+    return ResponseTitles(
+        message="게시글 제목 자동완성 성공",
+        data=autocomplete.title_index.search(q, limit),
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=ResponseBatchModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_posts_batch(ids: str = Query(example="1,2,3")) -> ResponseBatchModel:
+    """
+    게시글 여러 개 한 번에 조회 (쉼표로 구분한 게시글 번호 목록)
+    """
+    try:
+        post_ids = [int(post_id) for post_id in ids.split(",") if post_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="게시글 번호 목록이 올바르지 않습니다.",
+        )
+    return await load_posts_batch(post_ids)
+
+
+@router.post(
+    "/batch",
+    response_model=ResponseBatchModel,
+    status_code=status.HTTP_200_OK,
+)
+async def post_posts_batch(data: BatchIds) -> ResponseBatchModel:
+    """
+    게시글 여러 개 한 번에 조회 (URL 길이 제한을 넘는 목록은 본문으로 전달)
+    """
+    return await load_posts_batch(data.ids)
+
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    """쉼표로 구분한 include 값을 검증해서 집합으로 변환"""
+    if include is None:
+        return set()
+    includes = {name.strip() for name in include.split(",") if name.strip()}
+    if not includes <= POST_INCLUDES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include 값은 {', '.join(sorted(POST_INCLUDES))} 중에서 선택해야 합니다.",
+        )
+    return includes
+
+
+async def attach_includes(posts: List[Dict[str, Any]], includes: Set[str]) -> None:
+    """
+    게시글 목록(응답 JSON의 data 항목)에 댓글/댓글 수 채우기
+    게시글 개수와 상관없이 댓글은 IN 쿼리 한 번, 댓글 수는 카운터 조회 한 번으로 처리
+    댓글은 게시글마다 작성 순으로 최대 PAGE_SIZE개 (나머지는 댓글 목록 조회 API 사용)
+    """
+    if not includes or not posts:
+        return
+    post_ids = list({post["post_id"] for post in posts})
+    comments: Dict[int, List[Dict[str, Any]]] = {post_id: [] for post_id in post_ids}
+    counts: Dict[str, int] = {}
+    async with async_session() as session:
+        if "comments" in includes:
+            ranked = (
+                select(
+                    Comment,
+                    func.row_number()
+                    .over(
+                        partition_by=Comment.post_id,
+                        order_by=(Comment.created_at, Comment.com_id),
+                    )
+                    .label("row_number"),
+                )
+                .where(Comment.post_id.in_(post_ids))
+                .subquery()
+            )
+            names = [column.key for column in COMMENT_COLUMNS]
+            statement = (
+                select(*(ranked.c[name] for name in names))
+                .where(ranked.c.row_number <= PAGE_SIZE)
+                .order_by(ranked.c.post_id, ranked.c.row_number)
+            )
+            for res in (await session.exec(statement)).all():
+                comments[res.post_id].append(dict(zip(names, res)))
+        if "comment_count" in includes:
+            counts = await get_counts(
+                session, [post_comment_counter(post_id) for post_id in post_ids]
+            )
+    for post in posts:
+        if "comments" in includes:
+            post["comments"] = comments[post["post_id"]]
+        if "comment_count" in includes:
+            post["comment_count"] = counts[post_comment_counter(post["post_id"])]
+
+
+async def load_posts_batch(post_ids: List[int]) -> ResponseBatchModel:
+    """
+    캐시에 있는 게시글은 캐시에서, 나머지는 IN 쿼리 한 번으로 조회
+    요청한 순서대로 반환하고, 없는 게시글은 null로 채우고 missing에 기록
+    """
+    if len(post_ids) > settings.batch_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {settings.batch_max_ids}개까지 조회할 수 있습니다.",
+        )
+    keys = {post_key(post_id): post_id for post_id in post_ids}
+
+    async def load_posts(missing_keys: List[str]) -> Dict[str, Content]:
+        statement = select(Post).where(
+            Post.post_id.in_([keys[key] for key in missing_keys])
+        )
+        async with async_session() as session:
+            results = (await session.exec(statement)).all()
+        return {
+            post_key(res.post_id): Content(
+                post_id=res.post_id,
+                author=res.author,
+                title=res.title,
+                content=res.content,
+                created_at=res.created_at,
+            )
+            for res in results
+        }
+
+    found = await get_or_load_many(list(keys), Content, load_posts)
+    data = [found.get(post_key(post_id)) for post_id in post_ids]
+    missing = [post_id for post_id, res in zip(post_ids, data) if res == None]
+    return ResponseBatchModel(
+        message="게시글 여러 개 조회 성공", data=data, missing=missing
+    )
 
 
 @router.get(
@@ -75,26 +416,53 @@ async def get_posts(page: int = 1) -> ResponseListModel:
     response_model=ResponseModel,
     status_code=status.HTTP_200_OK,
 )
-async def get_post(post_id: int) -> ResponseModel:
+async def get_post(
+    request: Request,
+    post_id: int,
+    include: Optional[str] = Query(default=None, example="comments,comment_count"),
+    fields: Optional[str] = Query(default=None, example="post_id,title"),
+) -> Response:
     """
     게시글 조회
+    include 값이 있으면 댓글/댓글 수를 함께 조회
+    fields 값이 있으면 해당 필드만 응답 (게시글 캐시 하나를 모든 필드 조합이 공유)
+    ETag/Last-Modified가 요청 헤더와 일치하면 304 응답 (캐시 적중 시 DB 조회, 직렬화 없음)
     """
-    data = await session.get(Post, post_id)
-    if data == None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="게시글이 존재하지 않습니다.",
-        )
-    return ResponseModel(
-        message="게시글 조회 성공",
-        data=Content(
+    includes = parse_include(include)
+    fields = parse_fields(fields, POST_COLUMNS)
+
+    async def load_post() -> Optional[Content]:
+        async with async_session() as session:
+            data = await session.get(Post, post_id)
+        if data == None:
+            return None
+        return Content(
             post_id=data.post_id,
             author=data.author,
             title=data.title,
             content=data.content,
             created_at=data.created_at,
-        ),
-    )
+        )
+
+    entry = await get_or_load_entry(post_key(post_id), load_post)
+    if entry == None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="게시글이 존재하지 않습니다.",
+        )
+    raw, loaded_at = entry
+    if not includes:
+        if fields is not None:
+            raw = dump_json(pick_fields(orjson.loads(raw), fields))
+        return conditional_response(
+            request, wrap_data("게시글 조회 성공", raw), loaded_at
+        )
+    data = orjson.loads(raw)
+    await attach_includes([data], includes)
+    if fields is not None:
+        data = pick_fields(data, fields + sorted(includes))
+    result = {"message": "게시글 조회 성공", "data": data}
+    return conditional_response(request, dump_json(result))
 
 
 @router.put(
@@ -103,7 +471,10 @@ async def get_post(post_id: int) -> ResponseModel:
     status_code=status.HTTP_200_OK,
 )
 async def edit_post(
-    post_id: int, data: RequestBody, token: str = Depends(api_key_header)
+    post_id: int,
+    data: RequestBody,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseModel:
     """
     게시글 수정
@@ -114,20 +485,24 @@ async def edit_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글이 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if user_content.role != "admin" and token_user_id.get("user_id") != post.author:
+    if current_user.role != "admin" and current_user.user_id != post.author:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
+    if post.author != data.author:
+        await add_counts(
+            session,
+            {user_post_counter(post.author): -1, user_post_counter(data.author): 1},
+        )
     post.author = data.author
     post.title = data.title
     post.content = data.content
     session.add(post)
     await session.commit()
-    session.refresh(post)
-    post = await session.get(Post, post_id)
+    await invalidate(post_key(post_id), POST_LIST_KEY)
+    await autocomplete.update_titles([(post_id, data.title)])
+    await session.refresh(post)
     return ResponseModel(
         message=f"게시글 번호 {post_id} 수정 성공",
         data=Content(
@@ -146,7 +521,9 @@ async def edit_post(
     status_code=status.HTTP_200_OK,
 )
 async def delete_post(
-    post_id: int, token: str = Depends(api_key_header)
+    post_id: int,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseMessageModel:
     """
     게시글 삭제
@@ -157,15 +534,16 @@ async def delete_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글이 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_role = await session.get(User, token_user_id.get("user_id"))
-    if user_role.role != "admin" and token_user_id.get("user_id") != data.author:
+    if current_user.role != "admin" and current_user.user_id != data.author:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
-    session.delete(data)
+    await session.delete(data)
+    await add_counts(session, {user_post_counter(data.author): -1})
     await session.commit()
+    await invalidate(post_key(post_id), POST_LIST_KEY, post_comments_key(post_id))
+    await autocomplete.update_titles([(post_id, None)])
     return ResponseMessageModel(message=f"게시글 번호 {post_id} 삭제 성공")
 
 
@@ -174,22 +552,43 @@ async def delete_post(
     response_model=ResponseComList,
     status_code=status.HTTP_200_OK,
 )
-async def get_post_comments(post_id: int, page: int = 1) -> ResponseComList:
+async def get_post_comments(
+    request: Request,
+    post_id: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, example="com_id,content"),
+) -> Response:
     """
     게시글 별로 작성된 댓글 목록 조회
+    cursor 값이 있으면 page 대신 커서 기준으로 다음 페이지 조회
+    fields 값이 있으면 해당 컬럼만 조회해서 응답 (필드 조합별로 따로 캐시)
+    ETag/Last-Modified가 요청 헤더와 일치하면 304 응답
     """
-    data = []
-    offset = (page - 1) * 100
-    results = await session.exec(
-        select(Comment).where(Comment.post_id == post_id).offset(offset).limit(100)
-    ).all()
-    for res in results:
-        res_dict = CommentContent(
-            com_id=res.com_id,
-            author_id=res.author_id,
-            post_id=res.post_id,
-            content=res.content,
-            created_at=res.created_at,
+    fields = parse_fields(fields, COMMENT_COLUMNS)
+
+    async def load_comments() -> bytes:
+        columns = select_columns(COMMENT_COLUMNS, fields, "com_id", "created_at")
+        statement = paginate(
+            select(*columns).where(Comment.post_id == post_id),
+            Comment.created_at,
+            Comment.com_id,
+            page,
+            cursor,
         )
-        data.append(res_dict)
-    return ResponseComList(message="게시글 별로 작성된 댓글 목록 조회 성공", data=data)
+        async with async_session() as session:
+            results = (await session.exec(statement)).all()
+            counter = post_comment_counter(post_id)
+            total = (await get_counts(session, [counter]))[counter]
+        return dump_list(
+            "게시글 별로 작성된 댓글 목록 조회 성공",
+            results,
+            fields,
+            next_cursor=next_cursor(results, "com_id"),
+            total=total,
+        )
+
+    raw, loaded_at = await get_or_load_entry(
+        post_comments_key(post_id), load_comments, page_field(page, cursor, fields)
+    )
+    return conditional_response(request, raw, loaded_at)
@@ -1,13 +1,13 @@
 from datetime import timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from api.api_schema import (
-    CommentContent,
-    Content,
+    AuthUser,
     Login,
     ResponseAccessToken,
     ResponseComList,
@@ -17,49 +17,43 @@ from api.api_schema import (
     UserBody,
     UserSign,
 )
+from auth import decode_token_cached, get_current_user
+from cache import invalidate, user_key
 from common import (
     api_key_header,
-    decode_access_token,
+    check_password,
+    dump_list,
     encode_access_token,
-    password_hashing,
+    hash_password,
+    json_response,
+    next_cursor,
+    paginate,
+    parse_fields,
+    select_columns,
     settings,
-    verify_password,
 )
-from database import AuthToken, Comment, Post, User, engine
+from counter import get_counts, user_comment_counter, user_post_counter
+from database import COMMENT_COLUMNS, POST_COLUMNS, Comment, Post, User, get_session
+from token_store import token_store
 
-session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
-
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(
+    prefix="/api/users", tags=["users"], default_response_class=ORJSONResponse
+)
 
 
 async def add_token_to_db(token: str) -> None:
-    """db 토큰 저장소에 토큰 추가"""
-    auth_token = AuthToken(
-        token=token,
-    )
-    session.add(auth_token)
-    await session.commit()
+    """토큰 저장소에 토큰 추가 (토큰 만료 시각까지 유지)"""
+    await token_store.add(token, float(decode_token_cached(token)["exp"]))
 
 
 async def remove_token_from_db(token: str) -> None:
-    """db 토큰 저장소에서 토큰 제거"""
-    auth_token = await session.exec(
-        select(AuthToken).where(AuthToken.token == token)
-    ).first()
-    if auth_token is not None:
-        session.delete(auth_token)
-        session.commit()
+    """토큰 저장소에서 토큰 제거"""
+    await token_store.remove(token)
 
 
 async def is_token_in_db(token: str) -> bool:
-    """토큰이 db에 있는지 확인"""
-    auth_token = await session.exec(
-        select(AuthToken).where(AuthToken.token == token)
-    ).first()
-    if auth_token is not None:
-        return True
-    else:
-        return False
+    """토큰이 저장소에 있는지 확인"""
+    return await token_store.contains(token)
 
 
 @router.post(
@@ -67,11 +61,13 @@ async def is_token_in_db(token: str) -> bool:
     response_model=ResponseMessageModel,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_user(data: UserSign) -> ResponseMessageModel:
+async def create_user(
+    data: UserSign, session: AsyncSession = Depends(get_session)
+) -> ResponseMessageModel:
     """
     유저 생성
     """
-    cheacked_id = session.get(User, data.user_id)
+    cheacked_id = await session.get(User, data.user_id)
     if cheacked_id != None and data.user_id == cheacked_id.user_id:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -83,14 +79,14 @@ async def create_user(data: UserSign) -> ResponseMessageModel:
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="유저 비밀번호가 최소 8자 이상, 대문자 1개 이상 포함되는지 확인해주세요.",
         )
-    hashed_password = password_hashing.hash(data.password)
+    hashed_password = await hash_password(data.password)
     data = User(
         user_id=data.user_id,
         password=hashed_password,
         nickname=data.nickname,
     )
     session.add(data)
-    session.commit()
+    await session.commit()
     return ResponseMessageModel(message="유저 생성 성공")
 
 
@@ -100,20 +96,21 @@ async def create_user(data: UserSign) -> ResponseMessageModel:
     status_code=status.HTTP_200_OK,
 )
 async def edit_user(
-    user_id: str, data: UserBody, token: str = Depends(api_key_header)
+    user_id: str,
+    data: UserBody,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseUser:
     """
     유저 정보 수정
     """
-    res = session.get(User, user_id)
+    res = await session.get(User, user_id)
     if res == None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="유저 아이디가 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_content = session.get(User, token_user_id.get("user_id"))
-    if user_content.role != "admin" and token_user_id.get("user_id") != res.user_id:
+    if current_user.role != "admin" and current_user.user_id != res.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
@@ -125,14 +122,15 @@ async def edit_user(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="유저 비밀번호가 최소 8자 이상, 대문자 1개 이상 포함되는지 확인해주세요.",
         )
-    hashed_password = password_hashing.hash(data.password)
+    hashed_password = await hash_password(data.password)
 
     res.password = hashed_password
     res.nickname = data.nickname
     session.add(res)
-    session.commit()
-    session.refresh(res)
-    data = session.get(User, user_id)
+    await session.commit()
+    await invalidate(user_key(user_id))
+    await session.refresh(res)
+    data = res
     return ResponseUser(
         message=f"유저 아이디 {user_id} 수정 성공",
         data=UserSign(
@@ -149,7 +147,9 @@ async def edit_user(
     status_code=status.HTTP_200_OK,
 )
 async def delete_user(
-    user_id: str, token: str = Depends(api_key_header)
+    user_id: str,
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> ResponseMessageModel:
     """
     유저 삭제
@@ -160,15 +160,14 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="유저 삭제 실패. 유저 아이디가 존재하지 않습니다.",
         )
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if user_content.role != "admin" and token_user_id.get("user_id") != data.user_id:
+    if current_user.role != "admin" and current_user.user_id != data.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
-    session.delete(data)
+    await session.delete(data)
     await session.commit()
+    await invalidate(user_key(user_id))
     return ResponseMessageModel(message=f"유저 아이디 {user_id} 삭제 성공")
 
 
@@ -178,36 +177,45 @@ async def delete_user(
     status_code=status.HTTP_200_OK,
 )
 async def get_user_posts(
-    user_id: str, page: int = 1, token: str = Depends(api_key_header)
-) -> ResponseListModel:
+    user_id: str,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, example="post_id,title"),
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """
     유저별로 작성한 게시글 목록 조회
+    cursor 값이 있으면 page 대신 커서 기준으로 다음 페이지 조회
+    fields 값이 있으면 해당 컬럼만 조회해서 응답
     """
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if (
-        user_content.role != "admin"
-        and token_user_id.get("user_id") != user_content.user_id
-    ):
+    fields = parse_fields(fields, POST_COLUMNS)
+    if current_user.role != "admin" and current_user.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
-    data = []
-    offset = (page - 1) * 100
-    results = await session.exec(
-        select(Post).where(Post.author == user_id).offset(offset).limit(100)
-    ).all()
-    for res in results:
-        res_dict = Content(
-            post_id=res.post_id,
-            author=res.author,
-            title=res.title,
-            content=res.content,
-            created_at=res.created_at,
+    statement = paginate(
+        select(*select_columns(POST_COLUMNS, fields, "post_id", "created_at")).where(
+            Post.author == user_id
+        ),
+        Post.created_at,
+        Post.post_id,
+        page,
+        cursor,
+    )
+    results = (await session.exec(statement)).all()
+    counter = user_post_counter(user_id)
+    total = (await get_counts(session, [counter]))[counter]
+    return json_response(
+        dump_list(
+            "유저별 작성 게시글 목록 조회 성공",
+            results,
+            fields,
+            next_cursor=next_cursor(results, "post_id"),
+            total=total,
         )
-        data.append(res_dict)
-    return ResponseListModel(message="유저별 작성 게시글 목록 조회 성공", data=data)
+    )
 
 
 @router.get(
@@ -216,43 +224,54 @@ async def get_user_posts(
     status_code=status.HTTP_200_OK,
 )
 async def get_user_comments(
-    user_id: str, page: int = 1, token: str = Depends(api_key_header)
-) -> ResponseComList:
+    user_id: str,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, example="com_id,content"),
+    current_user: AuthUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """
     유저별로 작성한 댓글 목록 조회
+    cursor 값이 있으면 page 대신 커서 기준으로 다음 페이지 조회
+    fields 값이 있으면 해당 컬럼만 조회해서 응답
     """
-    token_user_id = decode_access_token(token)
-    user_content = await session.get(User, token_user_id.get("user_id"))
-    if (
-        user_content.role != "admin"
-        and token_user_id.get("user_id") != user_content.user_id
-    ):
+    fields = parse_fields(fields, COMMENT_COLUMNS)
+    if current_user.role != "admin" and current_user.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유저 아이디가 다릅니다.",
         )
-    data = []
-    offset = (page - 1) * 100
-    results = await session.exec(
-        select(Comment).where(Comment.author_id == user_id).offset(offset).limit(100)
-    ).all()
-    for res in results:
-        res_dict = CommentContent(
-            com_id=res.com_id,
-            author_id=res.author_id,
-            post_id=res.post_id,
-            content=res.content,
-            created_at=res.created_at,
+    statement = paginate(
+        select(*select_columns(COMMENT_COLUMNS, fields, "com_id", "created_at")).where(
+            Comment.author_id == user_id
+        ),
+        Comment.created_at,
+        Comment.com_id,
+        page,
+        cursor,
+    )
+    results = (await session.exec(statement)).all()
+    counter = user_comment_counter(user_id)
+    total = (await get_counts(session, [counter]))[counter]
+    return json_response(
+        dump_list(
+            "유저별 작성 댓글 조회 성공",
+            results,
+            fields,
+            next_cursor=next_cursor(results, "com_id"),
+            total=total,
         )
-        data.append(res_dict)
-    return ResponseComList(message="유저별 작성 댓글 조회 성공", data=data)
+    )
 
 
 @router.post(
     "/login",
     status_code=status.HTTP_200_OK,
 )
-async def post_user_login(data: Login) -> ResponseAccessToken:
+async def post_user_login(
+    data: Login, session: AsyncSession = Depends(get_session)
+) -> ResponseAccessToken:
     """
     유저 로그인
     """
@@ -262,7 +281,7 @@ async def post_user_login(data: Login) -> ResponseAccessToken:
             status_code=status.HTTP_404_NOT_FOUND,
             detail="유저 아이디가 존재하지 않습니다.",
         )
-    if not db_data or not verify_password(data.password, db_data.password):
+    if not db_data or not await check_password(data.password, db_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="아이디 혹은 비밀번호가 맞지 않습니다.",
@@ -271,7 +290,7 @@ async def post_user_login(data: Login) -> ResponseAccessToken:
     access_token = encode_access_token(
         data={"user_id": data.user_id}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    await add_token_to_db(access_token)
     return ResponseAccessToken(access_token=access_token, token_type="bearer")
 
 
@@ -285,7 +304,7 @@ async def post_user_logout(
     """
     유저 로그아웃
     """
-    if is_token_in_db(token) != True:
+    if await is_token_in_db(token) != True:
         return ResponseMessageModel(message="로그아웃 성공")
-    remove_token_from_db(token)
+    await remove_token_from_db(token)
     return ResponseMessageModel(message="로그아웃 성공")
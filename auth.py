@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple, Union
+
+from fastapi import Depends, HTTPException, status
+from jose import JWTError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.api_schema import AuthUser
+from cache import local_cache, user_key
+from common import api_key_header, decode_access_token, settings
+from database import User, get_session
+from token_store import token_store
+
+# 토큰 -> (만료 시각, 디코딩된 클레임), 가장 오래 사용되지 않은 토큰부터 제거
+_claims_cache: OrderedDict[str, Tuple[float, Dict[str, Union[str, int]]]] = (
+    OrderedDict()
+)
+
+
+def decode_token_cached(token: str) -> Dict[str, Union[str, int]]:
+    """
+    토큰 검증 결과를 토큰 만료 시각까지 캐시
+    같은 토큰으로 반복 요청 시 서명 검증 생략
+    """
+    entry = _claims_cache.get(token)
+    if entry is not None and entry[0] > time.time():
+        _claims_cache.move_to_end(token)
+        return entry[1]
+    try:
+        claims = decode_access_token(token)
+    except JWTError:
+        _claims_cache.pop(token, None)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유효하지 않은 토큰입니다.",
+        )
+    _claims_cache[token] = (float(claims["exp"]), claims)
+    if len(_claims_cache) > settings.token_cache_max_entries:
+        _claims_cache.popitem(last=False)
+    return claims
+
+
+async def get_current_user(
+    token: str = Depends(api_key_header),
+    session: AsyncSession = Depends(get_session),
+) -> AuthUser:
+    """
+    토큰의 유저 아이디와 권한 반환
+    로그아웃한 토큰은 토큰 저장소에 없으므로 거부 (없는 토큰은 블룸 필터로 바로 판별)
+    유저 정보는 워커 메모리에 짧게 캐시하고 유저 수정/삭제 시 무효화
+    """
+    user_id = decode_token_cached(token).get("user_id")
+    if not await token_store.contains(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유효하지 않은 토큰입니다.",
+        )
+    raw = local_cache.get(user_key(user_id))
+    if raw is not None:
+        return AuthUser.model_validate_json(raw)
+    user = await session.get(User, user_id)
+    if user == None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유저 아이디가 존재하지 않습니다.",
+        )
+    current_user = AuthUser(user_id=user.user_id, role=user.role)
+    local_cache.set(user_key(user_id), current_user.model_dump_json().encode())
+    return current_user
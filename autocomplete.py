@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import select
+
+import cache
+from database import Post, async_session
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 제목 변경 내용을 주고받는 redis pub/sub 채널
+TITLE_CHANNEL = "autocomplete:title"
+
+# 시작 시 post 테이블에서 한 번에 읽어오는 행 개수
+BUILD_BATCH_SIZE = 10000
+
+
+def normalize(title: str) -> str:
+    """대소문자, 앞뒤 공백 구분 없이 비교하기 위한 제목"""
+    return title.strip().casefold()
+
+
+class TitleIndex:
+    """
+    게시글 제목 접두사 검색용 워커 메모리 색인
+    중복 없는 정규화 제목 정렬 배열에서 bisect로 접두사 시작 위치를 찾아 앞에서부터 limit개 반환
+    같은 제목의 게시글 여러 개는 제목 하나로 묶어서 게시글 번호 목록으로 관리
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[str] = []
+        self._posts: Dict[str, Dict[int, str]] = {}
+        self._post_keys: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._post_keys)
+
+    def put(self, post_id: int, title: str) -> None:
+        """게시글 제목 추가 (이미 있으면 변경)"""
+        key = normalize(title)
+        if self._post_keys.get(post_id) != key:
+            self.remove(post_id)
+        if key not in self._posts:
+            self._posts[key] = {}
+            insort(self._keys, key)
+        self._posts[key][post_id] = title
+        self._post_keys[post_id] = key
+
+    def remove(self, post_id: int) -> None:
+        key = self._post_keys.pop(post_id, None)
+        if key is None:
+            return
+        posts = self._posts[key]
+        del posts[post_id]
+        if not posts:
+            del self._posts[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def search(self, prefix: str, limit: int) -> List[str]:
+        """접두사로 시작하는 제목을 사전 순으로 최대 limit개 반환"""
+        prefix = normalize(prefix)
+        start = bisect_left(self._keys, prefix)
+        titles = []
+        for key in self._keys[start : start + limit]:
+            if not key.startswith(prefix):
+                break
+            # 같은 제목의 게시글 중 먼저 등록된 게시글의 표기로 응답
+            titles.append(next(iter(self._posts[key].values())))
+        return titles
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str]]) -> "TitleIndex":
+        """(게시글 번호, 제목) 전체 목록으로 색인 생성 (정렬은 마지막에 한 번만)"""
+        index = cls()
+        for post_id, title in rows:
+            key = normalize(title)
+            index._posts.setdefault(key, {})[post_id] = title
+            index._post_keys[post_id] = key
+        index._keys = sorted(index._posts)
+        return index
+
+
+title_index = TitleIndex()
+
+# 색인 생성 중이면 그동안 들어온 변경 내용, 생성이 끝나면 새 색인에 다시 적용
+_pending: Optional[List[Tuple[int, Optional[str]]]] = None
+
+_build_task: Optional[asyncio.Task] = None
+
+ready = False
+
+
+async def build_title_index() -> None:
+    """post 테이블 전체 제목으로 색인을 새로 만들어 교체"""
+    global title_index, _pending, ready
+    _pending = []
+    try:
+        rows = []
+        async with async_session() as session:
+            statement = select(Post.post_id, Post.title).execution_options(
+                yield_per=BUILD_BATCH_SIZE
+            )
+            async for partition in (await session.stream(statement)).partitions():
+                rows.extend(partition)
+        index = TitleIndex.from_rows(rows)
+        for post_id, title in _pending:
+            _apply(index, post_id, title)
+        title_index = index
+        ready = True
+        logger.info("title index built: %d posts", len(index))
+    finally:
+        _pending = None
+
+
+def start_build() -> None:
+    """
+    백그라운드에서 색인 생성 시작 (진행 중이면 건너뜀)
+    생성이 끝나기 전까지 자동완성 API는 503 응답
+    """
+    global _build_task
+    if _build_task is not None and not _build_task.done():
+        return
+    _build_task = asyncio.create_task(build_title_index())
+
+    def done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("title index build failed: %s", task.exception())
+
+    _build_task.add_done_callback(done)
+
+
+async def stop_build() -> None:
+    if _build_task is None:
+        return
+    _build_task.cancel()
+    try:
+        await _build_task
+    except asyncio.CancelledError:
+        pass
+
+
+async def rebuild_everywhere() -> None:
+    """변경된 게시글 번호를 알 수 없을 때 모든 워커 색인을 다시 생성"""
+    start_build()
+    await cache.publish(TITLE_CHANNEL, "null")
+
+
+async def update_titles(changes: List[Tuple[int, Optional[str]]]) -> None:
+    """
+    게시글 생성/수정/삭제 내용을 이 워커 색인에 바로 반영하고 다른 워커에 전달
+    changes: (게시글 번호, 제목) 목록, 삭제된 게시글은 제목 None
+    """
+    if not changes:
+        return
+    _apply_changes(changes)
+    await cache.publish(TITLE_CHANNEL, json.dumps(changes, ensure_ascii=False))
+
+
+def _apply(index: TitleIndex, post_id: int, title: Optional[str]) -> None:
+    if title is None:
+        index.remove(post_id)
+    else:
+        index.put(post_id, title)
+
+
+def _apply_changes(changes: List[Tuple[int, Optional[str]]]) -> None:
+    for post_id, title in changes:
+        _apply(title_index, post_id, title)
+        if _pending is not None:
+            _pending.append((post_id, title))
+
+
+def _on_message(data: bytes) -> None:
+    changes = json.loads(data)
+    if changes is None:
+        start_build()
+        return
+    _apply_changes(changes)
+
+
+cache.subscribe(TITLE_CHANNEL, _on_message, start_build)
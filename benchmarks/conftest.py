@@ -0,0 +1,100 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import pytest
+
+# 서버 모듈을 불러오기 전에 벤치마크 전용 DB와 메모리 토큰 저장소 사용
+BENCHMARK_DB = "benchmarks.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{BENCHMARK_DB}"
+os.environ["TOKEN_STORE"] = "memory"
+os.environ["DB_SLOW_QUERY_MS"] = "100000"
+
+import datagen  # noqa: E402
+from common import encode_access_token, hash_password, settings  # noqa: E402
+from database import SQLModel, async_session, engine  # noqa: E402
+
+# 벤치마크 데이터 (같은 시드라 실행마다 같은 데이터)
+USERS = 10
+POSTS = 300
+COMMENTS = 3000
+
+# 기준 결과 저장 위치 / --benchmark-compare 시 기본 회귀 기준
+# 최솟값 기준 25% 이상 느려지면 실패 (중앙값/평균은 같은 코드도 실행마다 20% 안팎 흔들림)
+BASELINE_STORAGE = "file://./benchmarks/baselines"
+COMPARE_FAIL = "min:25%"
+
+
+def pytest_configure(config) -> None:
+    """옵션을 따로 주지 않은 경우 benchmarks/baselines에 저장하고 기본 기준으로 비교"""
+    from pytest_benchmark.utils import parse_compare_fail
+
+    if config.getoption("benchmark_storage") == "file://./.benchmarks":
+        config.option.benchmark_storage = BASELINE_STORAGE
+    if config.getoption("benchmark_compare") and not config.getoption(
+        "benchmark_compare_fail"
+    ):
+        config.option.benchmark_compare_fail = [parse_compare_fail(COMPARE_FAIL)]
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+    if os.path.exists(BENCHMARK_DB):
+        os.remove(BENCHMARK_DB)
+
+
+@pytest.fixture(scope="session")
+def dataset(loop):
+    """벤치마크 DB 생성 후 datagen으로 유저/게시글/댓글 생성"""
+
+    async def setup() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.drop_all)
+            await connection.run_sync(SQLModel.metadata.create_all)
+        async with async_session() as session:
+            await datagen.generate_data(
+                session,
+                USERS,
+                POSTS,
+                COMMENTS,
+                seed=0,
+                prefix="bench",
+                password=await hash_password(datagen.PASSWORD),
+                author_skew=1.1,
+                comment_skew=1.2,
+                chunk_size=1000,
+                progress=lambda table, done, elapsed: None,
+            )
+
+    loop.run_until_complete(setup())
+    return {"user_id": datagen.user_id("bench", 0), "post_id": 1}
+
+
+@pytest.fixture(scope="session")
+def client(loop, dataset):
+    """서버 프로세스 없이 ASGI 앱을 직접 호출하는 httpx 클라이언트"""
+    import httpx
+
+    from main import app
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    )
+    yield client
+    loop.run_until_complete(client.aclose())
+
+
+@pytest.fixture(scope="session")
+def token(loop, dataset):
+    from api.user import add_token_to_db
+
+    token = encode_access_token(
+        data={"user_id": dataset["user_id"]},
+        expires_delta=timedelta(days=settings.access_token_expire_days),
+    )
+    loop.run_until_complete(add_token_to_db(token))
+    return token
@@ -0,0 +1,82 @@
+"""
+부하 테스트(locustfile.py) 결과 리포트 생성/비교
+테스트 유저, 단어 목록 등 생성 데이터와 공유하는 값은 datagen.py
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+# 리포트에 저장하는 응답 시간 백분위
+PERCENTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+# 비교 시 값이 커지면 나빠지는 지표 / 작아지면 나빠지는 지표
+HIGHER_IS_WORSE = ["p50", "p95", "p99", "failure_ratio"]
+LOWER_IS_WORSE = ["rps"]
+
+
+def entry_report(entry) -> Dict[str, Any]:
+    """locust StatsEntry 하나의 요청 수, 실패율, 초당 요청 수, 응답 시간 백분위(ms)"""
+    report = {
+        "requests": entry.num_requests,
+        "failures": entry.num_failures,
+        "failure_ratio": round(entry.fail_ratio, 4),
+        "rps": round(entry.total_rps, 2),
+        "avg": round(entry.avg_response_time, 2),
+        "max": round(entry.max_response_time or 0, 2),
+    }
+    for name, percentile in PERCENTILES.items():
+        report[name] = entry.get_response_time_percentile(percentile)
+    return report
+
+
+def build_report(environment) -> Dict[str, Any]:
+    """locust 실행 결과를 JSON으로 저장할 리포트로 변환"""
+    stats = environment.stats
+    options = environment.parsed_options
+    return {
+        "scenario": [user_class.__name__ for user_class in environment.user_classes],
+        "host": environment.host,
+        "users": getattr(options, "num_users", None),
+        "spawn_rate": getattr(options, "spawn_rate", None),
+        "random_seed": getattr(options, "random_seed", None),
+        "started_at": datetime.fromtimestamp(
+            stats.total.start_time, timezone.utc
+        ).isoformat(),
+        "duration": (
+            round(stats.total.last_request_timestamp - stats.total.start_time, 2)
+            if stats.total.last_request_timestamp
+            else 0
+        ),
+        "total": entry_report(stats.total),
+        "endpoints": {
+            f"{entry.method} {entry.name}": entry_report(entry)
+            for entry in sorted(
+                stats.entries.values(), key=lambda entry: (entry.name, entry.method)
+            )
+        },
+    }
+
+
+def compare_reports(
+    base: Dict[str, Any], new: Dict[str, Any], threshold: float
+) -> Tuple[List[Tuple[str, str, float, float, float]], List[str]]:
+    """
+    두 리포트의 전체/엔드포인트별 지표 비교
+    반환 : ((엔드포인트, 지표, 이전 값, 새 값, 변화율 %) 목록, threshold % 이상 나빠진 항목 목록)
+    한쪽 리포트에만 있는 엔드포인트는 비교하지 않음
+    """
+    rows = []
+    regressions = []
+    targets = [("total", base["total"], new["total"])]
+    for name in sorted(base["endpoints"].keys() & new["endpoints"].keys()):
+        targets.append((name, base["endpoints"][name], new["endpoints"][name]))
+    for name, before, after in targets:
+        for metric in HIGHER_IS_WORSE + LOWER_IS_WORSE:
+            old, value = before[metric], after[metric]
+            change = (value - old) / old * 100 if old else 0.0
+            rows.append((name, metric, old, value, change))
+            worse = change if metric in HIGHER_IS_WORSE else -change
+            # 실패가 없다가 생긴 경우는 변화율로 비교할 수 없으므로 바로 회귀로 처리
+            if worse >= threshold or (metric == "failure_ratio" and not old and value):
+                regressions.append(f"{name} {metric}: {old} -> {value}")
+    return rows, regressions
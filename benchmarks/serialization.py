@@ -0,0 +1,124 @@
+"""
+목록 응답 한 페이지(PAGE_SIZE 행) 직렬화 CPU 시간 비교
+실행 : python -m benchmarks.serialization [--rounds 2000]
+
+- model : 행마다 Content 모델 생성 -> response_model 재검증 -> 표준 json 인코딩 (기존 방식)
+- raw : DB 조회 결과 행을 orjson으로 바로 인코딩 후 그대로 응답 (dump_list + json_response)
+- model (cache hit) : 캐시 JSON 파싱 -> response_model 재검증 -> 표준 json 인코딩 (기존 방식)
+- raw (cache hit) : 캐시 JSON 그대로 응답
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import typer
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.api_schema import Content, ResponseListModel
+from common import PAGE_SIZE, dump_list, json_response, next_cursor
+from database import POST_COLUMNS, Post, User
+
+
+def load_rows():
+    """메모리 SQLite에 한 페이지 분량 게시글을 넣고 목록 조회와 같은 컬럼으로 조회"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 3, 6, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        session.add(User(user_id="bench", password="", nickname="bench"))
+        session.add_all(
+            Post(
+                author="bench",
+                title=f"게시글 제목 {i}",
+                content="게시글 내용입니다. " * 20,
+                created_at=start + timedelta(seconds=i),
+            )
+            for i in range(PAGE_SIZE)
+        )
+        session.commit()
+        return session.exec(select(*POST_COLUMNS)).all()
+
+
+async def model_path(rows, field) -> bytes:
+    data = [
+        Content(
+            post_id=res.post_id,
+            author=res.author,
+            title=res.title,
+            content=res.content,
+            created_at=res.created_at,
+        )
+        for res in rows
+    ]
+    result = ResponseListModel(
+        message="게시글 목록 조회 성공",
+        data=data,
+        next_cursor=next_cursor(rows, "post_id"),
+        total=len(rows),
+    )
+    return await render(result, field)
+
+
+def raw_path(rows) -> bytes:
+    raw = dump_list(
+        "게시글 목록 조회 성공",
+        rows,
+        next_cursor=next_cursor(rows, "post_id"),
+        total=len(rows),
+    )
+    return json_response(raw).body
+
+
+async def render(result: ResponseListModel, field) -> bytes:
+    """FastAPI가 response_model로 응답을 만드는 과정 (재검증 -> jsonable 변환 -> json 인코딩)"""
+    content = await serialize_response(field=field, response_content=result)
+    return JSONResponse(content).body
+
+
+async def measure(func, rounds: int) -> float:
+    """한 번 실행에 걸린 평균 CPU 시간 (마이크로초)"""
+    for i in range(rounds + 1):
+        if i == 1:
+            start = time.process_time()
+        result = func()
+        if inspect.isawaitable(result):
+            await result
+    return (time.process_time() - start) / rounds * 1_000_000
+
+
+async def run(rounds: int) -> None:
+    rows = load_rows()
+    field = create_response_field(name="Response_get_posts", type_=ResponseListModel)
+    cached = raw_path(rows)
+    assert json.loads(await model_path(rows, field)) == json.loads(cached)
+
+    results = {
+        "model": await measure(lambda: model_path(rows, field), rounds),
+        "raw": await measure(lambda: raw_path(rows), rounds),
+        "model (cache hit)": await measure(
+            lambda: render(ResponseListModel.model_validate_json(cached), field),
+            rounds,
+        ),
+        "raw (cache hit)": await measure(lambda: json_response(cached).body, rounds),
+    }
+    typer.echo(f"{PAGE_SIZE}행 한 페이지, {len(cached)} bytes, {rounds}회 평균")
+    for name, elapsed in results.items():
+        typer.echo(f"{name:>18} : {elapsed:8.1f} us")
+    typer.echo(f"DB 조회 결과 직렬화 : {results['model'] / results['raw']:.1f}배 빠름")
+    typer.echo(
+        f"캐시 적중 응답 : {results['model (cache hit)'] / results['raw (cache hit)']:.1f}배 빠름"
+    )
+
+
+def main(rounds: int = typer.Option(2000, help="경로별 반복 횟수")) -> None:
+    asyncio.run(run(rounds))
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,148 @@
+"""
+요청마다 실행되는 주요 경로 마이크로 벤치마크 (pytest-benchmark)
+실행 방법은 README 참고, 기준 결과와 비교해서 느려지면 실패
+
+- 토큰 : 발급, 서명 검증, 검증 결과 캐시 hit
+- 응답 모델 : 한 페이지 분량 Content/CommentContent 목록 생성, 직렬화
+- 비밀번호 : bcrypt 해시/검증 (로그인, 회원가입 비용)
+- ASGI : 서버 프로세스 없이 httpx로 미들웨어 ~ DB 조회 ~ 응답 직렬화 전체 실행
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.api_schema import CommentContent, Content
+from auth import decode_token_cached
+from common import (
+    PAGE_SIZE,
+    decode_access_token,
+    dump_list,
+    encode_access_token,
+    hash_password,
+    verify_password,
+)
+from datagen import PASSWORD
+
+START = datetime(2024, 3, 6, tzinfo=timezone.utc)
+
+POST_ROWS = [
+    {
+        "post_id": i,
+        "author": "bench",
+        "title": f"게시글 제목 {i}",
+        "content": "게시글 내용입니다. " * 20,
+        "created_at": START + timedelta(seconds=i),
+    }
+    for i in range(PAGE_SIZE)
+]
+COMMENT_ROWS = [
+    {
+        "com_id": i,
+        "author_id": "bench",
+        "post_id": 1,
+        "content": f"댓글 내용 {i}",
+        "created_at": START + timedelta(seconds=i),
+    }
+    for i in range(PAGE_SIZE)
+]
+
+# DB 조회 결과 행처럼 _fields가 있는 튜플 (dump_list 입력)
+PostRow = namedtuple("PostRow", list(POST_ROWS[0]))
+
+
+@pytest.fixture(scope="module")
+def access_token():
+    return encode_access_token(
+        data={"user_id": "bench"}, expires_delta=timedelta(days=1)
+    )
+
+
+def test_encode_access_token(benchmark):
+    benchmark(
+        encode_access_token,
+        data={"user_id": "bench"},
+        expires_delta=timedelta(days=1),
+    )
+
+
+def test_decode_access_token(benchmark, access_token):
+    claims = benchmark(decode_access_token, access_token)
+    assert claims["user_id"] == "bench"
+
+
+def test_decode_token_cached(benchmark, access_token):
+    decode_token_cached(access_token)
+    claims = benchmark(decode_token_cached, access_token)
+    assert claims["user_id"] == "bench"
+
+
+def test_build_contents(benchmark):
+    def build():
+        return [Content(**row) for row in POST_ROWS]
+
+    assert len(benchmark(build)) == PAGE_SIZE
+
+
+def test_dump_contents(benchmark):
+    contents = [Content(**row) for row in POST_ROWS]
+    benchmark(lambda: [content.model_dump_json() for content in contents])
+
+
+def test_build_comment_contents(benchmark):
+    def build():
+        return [CommentContent(**row) for row in COMMENT_ROWS]
+
+    assert len(benchmark(build)) == PAGE_SIZE
+
+
+def test_dump_list(benchmark):
+    rows = [PostRow(**row) for row in POST_ROWS]
+    benchmark(dump_list, "게시글 목록 조회 성공", rows, next_cursor=None)
+
+
+def test_hash_password(benchmark, loop):
+    # bcrypt는 한 번에 수백 ms라 반복 횟수를 줄여서 측정
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(hash_password(PASSWORD)),
+        rounds=5,
+        iterations=1,
+    )
+
+
+def test_verify_password(benchmark, loop):
+    hashed = loop.run_until_complete(hash_password(PASSWORD))
+    assert benchmark.pedantic(
+        verify_password, args=(PASSWORD, hashed), rounds=5, iterations=1
+    )
+
+
+def request(loop, client, url, headers=None):
+    """이벤트 루프에서 요청 하나 실행 후 응답 상태 확인"""
+
+    async def send():
+        response = await client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        return response
+
+    return lambda: loop.run_until_complete(send())
+
+
+def test_asgi_get_posts(benchmark, loop, client):
+    benchmark(request(loop, client, "/api/posts/?page=1"))
+
+
+def test_asgi_get_post(benchmark, loop, client, dataset):
+    benchmark(request(loop, client, f"/api/posts/{dataset['post_id']}"))
+
+
+def test_asgi_get_post_comments(benchmark, loop, client, dataset):
+    benchmark(
+        request(loop, client, f"/api/posts/{dataset['post_id']}/comments/?page=1")
+    )
+
+
+def test_asgi_get_user_posts(benchmark, loop, client, dataset, token):
+    url = f"/api/users/{dataset['user_id']}/posts/?page=1"
+    benchmark(request(loop, client, url, headers={"Authorization": token}))
@@ -0,0 +1,578 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from weakref import WeakSet
+
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from common import settings
+
+logger = logging.getLogger(__name__)
+
+redis = aioredis.from_url(settings.redis_url)
+
+# 캐시 적중/미스 횟수
+# local_hit: 워커 메모리에서 적중, hit: redis에서 적중, error: redis 통신 실패 횟수
+# stale: 만료된 값을 응답하고 백그라운드 갱신한 횟수
+# coalesced: 진행 중인 같은 조회 결과를 공유해서 DB 조회를 생략한 횟수
+stats: Dict[str, int] = {
+    "local_hit": 0,
+    "hit": 0,
+    "miss": 0,
+    "stale": 0,
+    "coalesced": 0,
+    "error": 0,
+}
+
+# 게시글 목록 페이지들을 담는 hash 키 (field: 페이지 조건)
+POST_LIST_KEY = "post:list"
+
+# 워커 간 메모리 캐시 무효화 메시지를 주고받는 redis pub/sub 채널
+INVALIDATE_CHANNEL = "cache:invalidate"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class LocalCache:
+    """
+    워커 프로세스 메모리 LRU 캐시
+    항목 개수와 전체 바이트 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size = 0
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, bytes]] = OrderedDict()
+        # redis hash 키 단위로 무효화하기 위한 키 -> field 목록
+        self._fields: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, field: str = "") -> Optional[bytes]:
+        entry = self._entries.get((key, field))
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._pop(key, field)
+            return None
+        self._entries.move_to_end((key, field))
+        return payload
+
+    def set(self, key: str, payload: bytes, field: str = "") -> None:
+        if len(payload) > self.max_bytes:
+            return
+        self._pop(key, field)
+        self._entries[(key, field)] = (time.monotonic() + self.ttl_seconds, payload)
+        self._fields[key].add(field)
+        self.size += len(payload)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            oldest_key, oldest_field = next(iter(self._entries))
+            self._pop(oldest_key, oldest_field)
+
+    def invalidate(self, key: str) -> None:
+        """키에 속한 모든 field 제거"""
+        for field in list(self._fields.get(key, ())):
+            self._pop(key, field)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fields.clear()
+        self.size = 0
+
+    def _pop(self, key: str, field: str) -> None:
+        entry = self._entries.pop((key, field), None)
+        if entry is None:
+            return
+        self.size -= len(entry[1])
+        fields = self._fields[key]
+        fields.discard(field)
+        if not fields:
+            del self._fields[key]
+
+
+local_cache = LocalCache(
+    max_entries=settings.local_cache_max_entries,
+    max_bytes=settings.local_cache_max_bytes,
+    ttl_seconds=settings.local_cache_ttl_seconds,
+)
+
+_listener_task: Optional[asyncio.Task] = None
+
+# 캐시 무효화 외에 워커 메모리 상태를 맞추기 위한 채널 -> (메시지 처리, 재동기화) 함수
+_channel_handlers: Dict[str, Tuple[Callable[[bytes], None], Callable[[], None]]] = {}
+
+# 워커 안에서 진행 중인 캐시 조회 (키, field, 갱신 여부) -> 조회 작업
+_inflight: Dict[Tuple[str, str, bool], asyncio.Task] = {}
+
+# 실행 중에 키가 무효화된 조회 작업 (변경 전 값일 수 있으므로 캐시에 저장하지 않음)
+_invalidated_loads: "WeakSet[asyncio.Task]" = WeakSet()
+
+# 진행 중인 묶음 조회 번호 -> (조회 중인 키, 조회 중에 무효화된 키)
+_batch_loads: Dict[int, Tuple[Set[str], Set[str]]] = {}
+_batch_ids = itertools.count()
+
+
+def post_key(post_id: int) -> str:
+    """게시글 단건 캐시 키"""
+    return f"post:{post_id}"
+
+
+def post_comments_key(post_id: int) -> str:
+    """게시글 별 댓글 목록 페이지들을 담는 hash 키"""
+    return f"post:{post_id}:comments"
+
+
+def user_key(user_id: str) -> str:
+    """인증 유저 정보(아이디, 권한) 메모리 캐시 키"""
+    return f"user:{user_id}"
+
+
+def page_field(
+    page: int, cursor: Optional[str], fields: Optional[List[str]] = None
+) -> str:
+    """목록 hash 안에서 페이지(와 응답 필드 목록)를 구분하는 field"""
+    field = f"page={page}&cursor={cursor or ''}"
+    if fields is not None:
+        field += f"&fields={','.join(fields)}"
+    return field
+
+
+async def get_or_load(
+    key: str,
+    model: Type[ModelT],
+    loader: Callable[[], Awaitable[Optional[ModelT]]],
+    field: Optional[str] = None,
+) -> Optional[ModelT]:
+    """
+    read-through 조회 후 model로 변환 (조회 방식은 get_or_load_json 참고)
+    """
+    raw = await get_or_load_json(key, loader, field)
+    if raw is None:
+        return None
+    return model.model_validate_json(raw)
+
+
+async def get_or_load_json(
+    key: str,
+    loader: Callable[[], Awaitable[Union[BaseModel, bytes, None]]],
+    field: Optional[str] = None,
+) -> Optional[bytes]:
+    """
+    read-through 조회, 캐시에 저장된 JSON 그대로 반환 (응답에 바로 쓰면 파싱/직렬화 생략)
+    조회 방식은 get_or_load_entry 참고
+    """
+    entry = await get_or_load_entry(key, loader, field)
+    if entry is None:
+        return None
+    return entry[0]
+
+
+async def get_or_load_entry(
+    key: str,
+    loader: Callable[[], Awaitable[Union[BaseModel, bytes, None]]],
+    field: Optional[str] = None,
+) -> Optional[Tuple[bytes, float]]:
+    """
+    read-through 조회, (캐시에 저장된 JSON, DB에서 읽은 시각) 반환
+    데이터가 바뀌면 캐시가 무효화되므로 읽은 시각 이후로는 바뀌지 않은 값 (Last-Modified로 사용)
+    워커 메모리 -> redis -> loader(DB) 순서로 조회하고, 찾은 값은 앞 단계 캐시에 채움
+    만료 시간이 지난 값은 그대로 응답하고 백그라운드에서 한 번만 갱신 (stale-while-revalidate)
+    같은 키에 대한 동시 미스는 조회 한 번의 결과를 공유 (single-flight)
+    loader는 요청 상태에 의존하지 않아야 하며, 모델 혹은 JSON bytes를 반환 (None이면 캐시하지 않음)
+    """
+    cached = _unpack(local_cache.get(key, field or ""))
+    if cached is not None:
+        stats["local_hit"] += 1
+    else:
+        entry = await _read(key, field)
+        cached = _unpack(entry)
+        if cached is not None:
+            stats["hit"] += 1
+            local_cache.set(key, entry, field or "")
+    if cached is not None:
+        fresh_until, raw = cached
+        if fresh_until < time.time():
+            stats["stale"] += 1
+            _start_flight(key, field, loader, refresh=True)
+        return raw, fresh_until - settings.cache_ttl_seconds
+    stats["miss"] += 1
+    entry = await asyncio.shield(_start_flight(key, field, loader, refresh=False))
+    cached = _unpack(entry)
+    if cached is None:
+        return None
+    fresh_until, raw = cached
+    return raw, fresh_until - settings.cache_ttl_seconds
+
+
+async def get_or_load_many(
+    keys: List[str],
+    model: Type[ModelT],
+    loader: Callable[[List[str]], Awaitable[Dict[str, ModelT]]],
+) -> Dict[str, ModelT]:
+    """
+    여러 키를 한 번에 read-through 조회
+    워커 메모리 -> redis MGET 한 번 -> 남은 키 목록으로 loader 한 번 호출
+    만료 시간이 지난 값은 loader 조회에 포함해서 함께 갱신
+    반환값에 없는 키는 존재하지 않는 데이터
+    """
+    entries: Dict[str, bytes] = {}
+    remote_keys = []
+    for key in dict.fromkeys(keys):
+        entry = local_cache.get(key)
+        if entry is not None:
+            stats["local_hit"] += 1
+            entries[key] = entry
+        else:
+            remote_keys.append(key)
+    if remote_keys:
+        for key, entry in zip(remote_keys, await _read_many(remote_keys)):
+            if _unpack(entry) is not None:
+                stats["hit"] += 1
+                local_cache.set(key, entry)
+                entries[key] = entry
+    values: Dict[str, ModelT] = {}
+    missing_keys = []
+    now = time.time()
+    for key in dict.fromkeys(keys):
+        cached = _unpack(entries.get(key))
+        if cached is None:
+            stats["miss"] += 1
+            missing_keys.append(key)
+            continue
+        fresh_until, raw = cached
+        if fresh_until < now:
+            stats["stale"] += 1
+            missing_keys.append(key)
+        values[key] = model.model_validate_json(raw)
+    if not missing_keys:
+        return values
+    # 조회 중에 무효화된 키는 변경 전 값일 수 있으므로 응답에만 쓰고 캐시에는 저장하지 않음
+    batch_id = next(_batch_ids)
+    invalidated: Set[str] = set()
+    _batch_loads[batch_id] = (set(missing_keys), invalidated)
+    try:
+        loaded = await loader(missing_keys)
+        for key in missing_keys:
+            # 만료된 값이었는데 DB에서 사라졌으면 결과에서도 제외
+            values.pop(key, None)
+        packed = {}
+        for key, value in loaded.items():
+            values[key] = value
+            if key in invalidated:
+                continue
+            packed[key] = _pack(value.model_dump_json().encode())
+            local_cache.set(key, packed[key])
+        await _write_many(packed)
+        # 저장하는 동안 무효화된 키는 무효화 이후에 저장되었을 수 있으므로 다시 삭제
+        for key in invalidated & packed.keys():
+            local_cache.invalidate(key)
+            await _delete(key, None)
+    finally:
+        del _batch_loads[batch_id]
+    return values
+
+
+async def invalidate(*keys: str) -> None:
+    """
+    데이터 변경 시 관련 캐시 키 삭제
+    다른 워커의 메모리 캐시도 지워지도록 pub/sub 채널에 키 목록 발행
+    """
+    _invalidate_local(keys)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            pipe.publish(INVALIDATE_CHANNEL, json.dumps(keys))
+            await pipe.execute()
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("cache invalidate failed: %s (%s)", keys, e)
+
+
+def subscribe(
+    channel: str, handler: Callable[[bytes], None], resync: Callable[[], None]
+) -> None:
+    """
+    무효화 구독에 채널 추가 (start_invalidation_listener 전에 등록)
+    handler는 자기 워커가 발행한 메시지도 받으므로 같은 메시지를 두 번 처리해도 안전해야 함
+    구독이 끊겼다가 다시 연결되면 놓친 메시지가 있을 수 있으므로 resync 호출
+    """
+    _channel_handlers[channel] = (handler, resync)
+
+
+async def publish(channel: str, message: str) -> None:
+    """다른 워커에 메시지 발행, redis 장애 시 로그만 남김"""
+    try:
+        await redis.publish(channel, message)
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("publish failed: %s (%s)", channel, e)
+
+
+async def start_invalidation_listener() -> None:
+    """워커 시작 시 다른 워커가 발행한 무효화 메시지 구독 시작"""
+    global _listener_task
+    _listener_task = asyncio.create_task(_listen_invalidation())
+
+
+async def stop_invalidation_listener() -> None:
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+
+
+async def _listen_invalidation() -> None:
+    disconnected = False
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATE_CHANNEL, *_channel_handlers)
+                if disconnected:
+                    disconnected = False
+                    for _, resync in _channel_handlers.values():
+                        resync()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    channel = message["channel"].decode()
+                    if channel in _channel_handlers:
+                        _channel_handlers[channel][0](message["data"])
+                        continue
+                    _invalidate_local(json.loads(message["data"]))
+        except RedisError as e:
+            # 구독이 끊긴 동안 놓친 메시지가 있을 수 있으므로 메모리 캐시 전체 삭제
+            local_cache.clear()
+            disconnected = True
+            logger.warning("cache invalidation listener disconnected: %s", e)
+            await asyncio.sleep(1)
+
+
+def _invalidate_local(keys: List[str]) -> None:
+    """
+    워커 메모리 캐시에서 키 삭제
+    변경 전에 시작된 조회는 이후 요청이 공유하지 않도록 제외하고, 결과를 캐시에 저장하지 않도록 표시
+    """
+    for key in keys:
+        local_cache.invalidate(key)
+    for flight_key in [k for k in _inflight if k[0] in keys]:
+        _invalidated_loads.add(_inflight.pop(flight_key))
+    for loading, invalidated in _batch_loads.values():
+        invalidated.update(loading.intersection(keys))
+
+
+def _start_flight(
+    key: str,
+    field: Optional[str],
+    loader: Callable[[], Awaitable[Union[BaseModel, bytes, None]]],
+    refresh: bool,
+) -> asyncio.Task:
+    """
+    같은 (키, field)로 진행 중인 조회가 있으면 그 작업을, 없으면 새 조회 작업을 반환
+    조회는 요청과 별도 작업으로 실행되어 먼저 온 요청이 취소되어도 기다리는 요청에 영향 없음
+    """
+    flight_key = (key, field or "", refresh)
+    task = _inflight.get(flight_key)
+    if task is not None:
+        stats["coalesced"] += 1
+        return task
+    task = asyncio.create_task(_load(key, field, loader, refresh))
+    _inflight[flight_key] = task
+
+    def done(finished: asyncio.Task) -> None:
+        if _inflight.get(flight_key) is finished:
+            del _inflight[flight_key]
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.warning("cache load failed: %s (%s)", key, finished.exception())
+
+    task.add_done_callback(done)
+    return task
+
+
+async def _load(
+    key: str,
+    field: Optional[str],
+    loader: Callable[[], Awaitable[Union[BaseModel, bytes, None]]],
+    refresh: bool,
+) -> Optional[bytes]:
+    """
+    redis 락을 잡은 워커 하나만 DB 조회 후 캐시에 저장
+    락을 못 잡으면 갱신은 생략하고, 미스는 다른 워커가 채운 값을 잠시 기다림
+    """
+    lock = redis.lock(
+        f"lock:{key}:{field or ''}",
+        timeout=settings.cache_lock_timeout_ms / 1000,
+        blocking=False,
+    )
+    try:
+        locked = await lock.acquire()
+    except RedisError as e:
+        # redis 장애 시에는 워커 단위 single-flight만 적용
+        stats["error"] += 1
+        logger.warning("cache lock failed: %s (%s)", key, e)
+        locked = None
+    if locked is False:
+        if refresh:
+            return None
+        entry = await _wait_for_peer(key, field, lock.name)
+        if entry is not None:
+            return entry
+    try:
+        value = await loader()
+        if value is None:
+            return None
+        raw = value if isinstance(value, bytes) else value.model_dump_json().encode()
+        entry = _pack(raw)
+        # 조회 중에 데이터가 바뀌었으면 기다리던 요청에만 응답하고 캐시에는 저장하지 않음
+        task = asyncio.current_task()
+        if task in _invalidated_loads:
+            return entry
+        local_cache.set(key, entry, field or "")
+        await _write(key, field, entry)
+        if task in _invalidated_loads:
+            # 저장하는 동안 무효화되었으면 무효화 이후에 저장되었을 수 있으므로 다시 삭제
+            local_cache.invalidate(key)
+            await _delete(key, field)
+        return entry
+    finally:
+        if locked:
+            try:
+                await lock.release()
+            except RedisError:
+                # 조회가 락 만료 시간보다 오래 걸린 경우
+                pass
+
+
+async def _wait_for_peer(
+    key: str, field: Optional[str], lock_name: str
+) -> Optional[bytes]:
+    """
+    다른 워커가 락 만료 시간 안에 캐시를 채우면 그 값 반환
+    값을 채우지 않고 락을 풀면(없는 데이터 등) 바로 None 반환
+    """
+    deadline = time.monotonic() + settings.cache_lock_timeout_ms / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                if field is None:
+                    pipe.get(key)
+                else:
+                    pipe.hget(key, field)
+                pipe.exists(lock_name)
+                entry, locked = await pipe.execute()
+        except RedisError as e:
+            stats["error"] += 1
+            logger.warning("cache read failed: %s (%s)", key, e)
+            return None
+        if _unpack(entry) is not None:
+            return entry
+        if not locked:
+            return None
+    return None
+
+
+def _pack(raw: bytes) -> bytes:
+    """캐시 값 앞에 갱신 필요 시각(fresh_until) 추가"""
+    fresh_until = time.time() + settings.cache_ttl_seconds
+    return f"{fresh_until:.3f}|".encode() + raw
+
+
+def _unpack(entry: Optional[bytes]) -> Optional[Tuple[float, bytes]]:
+    """
+    (갱신 필요 시각, 캐시 값) 반환
+    fresh_until이 없는 이전 형식 값(배포 중 다른 버전이 저장한 값)은 미스로 처리
+    """
+    if entry is None:
+        return None
+    fresh_until, _, raw = entry.partition(b"|")
+    try:
+        return float(fresh_until), raw
+    except ValueError:
+        return None
+
+
+async def _read(key: str, field: Optional[str]) -> Optional[bytes]:
+    try:
+        if field is None:
+            return await redis.get(key)
+        return await redis.hget(key, field)
+    except RedisError as e:
+        # redis 장애 시에도 DB 조회로 응답은 가능하도록 미스로 처리
+        stats["error"] += 1
+        logger.warning("cache read failed: %s (%s)", key, e)
+        return None
+
+
+async def _read_many(keys: List[str]) -> List[Optional[bytes]]:
+    try:
+        return await redis.mget(keys)
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("cache read failed: %s (%s)", keys, e)
+        return [None] * len(keys)
+
+
+async def _write_many(entries: Dict[str, bytes]) -> None:
+    if not entries:
+        return
+    expire_seconds = settings.cache_ttl_seconds + settings.cache_stale_seconds
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, payload in entries.items():
+                pipe.set(key, payload, ex=expire_seconds)
+            await pipe.execute()
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("cache write failed: %s (%s)", list(entries), e)
+
+
+async def _delete(key: str, field: Optional[str]) -> None:
+    try:
+        if field is None:
+            await redis.delete(key)
+            return
+        await redis.hdel(key, field)
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("cache delete failed: %s (%s)", key, e)
+
+
+async def _write(key: str, field: Optional[str], payload: bytes) -> None:
+    # 갱신 필요 시각이 지나도 stale 구간 동안은 redis에 남겨둠
+    expire_seconds = settings.cache_ttl_seconds + settings.cache_stale_seconds
+    try:
+        if field is None:
+            await redis.set(key, payload, ex=expire_seconds)
+            return
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, payload)
+            # 목록 hash는 처음 만들어질 때만 만료 시간 설정
+            pipe.expire(key, expire_seconds, nx=True)
+            await pipe.execute()
+    except RedisError as e:
+        stats["error"] += 1
+        logger.warning("cache write failed: %s (%s)", key, e)
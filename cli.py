@@ -0,0 +1,295 @@
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import typer
+from sqlalchemy import insert, inspect, text
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import counter
+import datagen
+from common import chunked, hash_password
+from database import Comment, Post, SQLModel, User, async_session, engine
+from search import rebuild_search_index
+
+app = typer.Typer()
+
+
+@app.callback()
+def main() -> None:
+    """
+    fastapi-server 관리 명령 (사용법: python cli.py <명령> --help)
+    """
+
+
+@app.command()
+def create_indexes(
+    dry_run: bool = typer.Option(False, help="실행하지 않고 DDL만 출력"),
+) -> None:
+    """
+    모델에 선언된 인덱스 중 DB에 없는 인덱스 생성
+    MySQL은 테이블 잠금 없이(ALGORITHM=INPLACE, LOCK=NONE) 생성
+    """
+    asyncio.run(_create_indexes(dry_run))
+
+
+async def _create_indexes(dry_run: bool) -> None:
+    async with engine.connect() as connection:
+        existing = await connection.run_sync(_existing_indexes)
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing:
+            typer.echo(f"{table.name}: 테이블이 없어 건너뜀")
+            continue
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing[table.name]:
+                typer.echo(f"{index.name}: 이미 존재")
+                continue
+            ddl = str(CreateIndex(index).compile(dialect=engine.dialect))
+            if engine.dialect.name == "mysql":
+                ddl += " ALGORITHM=INPLACE LOCK=NONE"
+            typer.echo(ddl)
+            if dry_run:
+                continue
+            # 인덱스마다 따로 커밋해서 중간에 실패해도 앞서 만든 인덱스는 유지
+            async with engine.begin() as connection:
+                await connection.execute(text(ddl))
+    await engine.dispose()
+
+
+def _existing_indexes(connection) -> dict:
+    """테이블 이름 -> 이미 존재하는 인덱스 이름 목록"""
+    inspector = inspect(connection)
+    return {
+        table_name: {index["name"] for index in inspector.get_indexes(table_name)}
+        for table_name in inspector.get_table_names()
+    }
+
+
+@app.command()
+def reconcile_counters(
+    dry_run: bool = typer.Option(False, help="수정하지 않고 차이만 출력"),
+) -> None:
+    """
+    게시글/댓글 개수 카운터를 원본 테이블 집계 값으로 맞춤
+    카운터 도입 전 데이터가 있거나 DB를 직접 수정한 뒤 실행
+    """
+    asyncio.run(_reconcile_counters(dry_run))
+
+
+async def _reconcile_counters(dry_run: bool) -> None:
+    async with async_session() as session:
+        changed = await counter.reconcile(session, dry_run)
+    for name, (stored, actual) in changed.items():
+        typer.echo(f"{name}: {stored} -> {actual}")
+    typer.echo(f"카운터 {len(changed)}개 {'불일치' if dry_run else '수정'}")
+    await engine.dispose()
+
+
+@app.command()
+def rebuild_search() -> None:
+    """
+    게시글 검색 인덱스를 post 테이블 전체 내용으로 다시 생성
+    검색 인덱스 도입 전 DB는 배포 후 한 번 실행
+    """
+    asyncio.run(_rebuild_search())
+
+
+async def _rebuild_search() -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(rebuild_search_index)
+    typer.echo("검색 인덱스 재생성 완료")
+    await engine.dispose()
+
+
+@app.command()
+def seed_loadtest(
+    users: int = typer.Option(datagen.LOADTEST_USERS, help="생성할 유저 수"),
+    posts: int = typer.Option(1000, help="생성할 게시글 수"),
+    comments: int = typer.Option(5000, help="생성할 댓글 수"),
+    seed: int = typer.Option(0, help="난수 시드 (같은 시드면 같은 데이터)"),
+    chunk_size: int = typer.Option(1000, help="INSERT 한 번에 넣는 행 개수"),
+) -> None:
+    """
+    부하 테스트(locustfile.py)용 유저/게시글/댓글 생성
+    유저 비밀번호는 모두 같고(datagen.py), 이미 있는 유저는 건너뜀
+    """
+    asyncio.run(_seed_loadtest(users, posts, comments, seed, chunk_size))
+
+
+async def _seed_loadtest(
+    users: int, posts: int, comments: int, seed: int, chunk_size: int
+) -> None:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    async with async_session() as session:
+        user_ids = [datagen.loadtest_user_id(number) for number in range(users)]
+        statement = select(User.user_id).where(User.user_id.in_(user_ids))
+        existing = set((await session.exec(statement)).all())
+        # bcrypt 해시는 느리므로 한 번만 계산해서 모든 유저에 사용
+        password = await hash_password(datagen.PASSWORD)
+        rows = [
+            {"user_id": user_id, "password": password, "nickname": user_id}
+            for user_id in user_ids
+            if user_id not in existing
+        ]
+        for chunk in chunked(rows, chunk_size):
+            await session.execute(insert(User), chunk)
+        typer.echo(f"유저 {len(rows)}개 생성 ({users - len(rows)}개는 이미 존재)")
+
+        rows = []
+        for number in range(posts):
+            words = rng.sample(datagen.WORDS, 3)
+            rows.append(
+                {
+                    "author": rng.choice(user_ids),
+                    "title": " ".join(words[:2]),
+                    "content": " ".join(words) * 10,
+                    "created_at": start + timedelta(seconds=number),
+                }
+            )
+        for chunk in chunked(rows, chunk_size):
+            await session.execute(insert(Post), chunk)
+        # 방금 생성한 게시글 번호 (게시글 번호는 생성 순서대로 증가)
+        statement = select(Post.post_id).order_by(Post.post_id.desc()).limit(posts)
+        post_ids = (await session.exec(statement)).all()
+        typer.echo(f"게시글 {len(rows)}개 생성")
+
+        rows = [
+            {
+                "author_id": rng.choice(user_ids),
+                "post_id": rng.choice(post_ids),
+                "content": rng.choice(datagen.WORDS),
+                "created_at": start + timedelta(seconds=number),
+            }
+            for number in range(comments if post_ids else 0)
+        ]
+        for chunk in chunked(rows, chunk_size):
+            await session.execute(insert(Comment), chunk)
+        await session.commit()
+        typer.echo(f"댓글 {len(rows)}개 생성")
+        # INSERT로 넣은 행은 카운터를 거치지 않으므로 실제 개수로 맞춤
+        await counter.reconcile(session)
+    await engine.dispose()
+
+
+@app.command()
+def generate_data(
+    users: int = typer.Option(10000, min=1, help="생성할 유저 수"),
+    posts: int = typer.Option(100000, min=0, help="생성할 게시글 수"),
+    comments: int = typer.Option(1000000, min=0, help="생성할 댓글 수"),
+    seed: int = typer.Option(0, help="난수 시드 (같은 시드, 옵션이면 같은 데이터)"),
+    prefix: str = typer.Option("gen", help="생성할 유저 아이디 접두사"),
+    author_skew: float = typer.Option(
+        1.1, min=0, help="작성자 쏠림 정도 (0: 고르게, 클수록 소수 유저에 집중)"
+    ),
+    comment_skew: float = typer.Option(
+        1.2, min=0, help="댓글 쏠림 정도 (0: 고르게, 클수록 소수 게시글에 집중)"
+    ),
+    chunk_size: int = typer.Option(
+        10000, min=1, help="INSERT/커밋 한 번에 넣는 행 개수"
+    ),
+) -> None:
+    """
+    규모 테스트용 유저/게시글/댓글 대량 생성 (SQLite, MySQL)
+    유저 아이디는 <prefix>00000000 형식, 비밀번호는 부하 테스트 유저와 같음
+    """
+    asyncio.run(
+        _generate_data(
+            users,
+            posts,
+            comments,
+            seed,
+            prefix,
+            author_skew,
+            comment_skew,
+            chunk_size,
+        )
+    )
+
+
+async def _generate_data(
+    users: int,
+    posts: int,
+    comments: int,
+    seed: int,
+    prefix: str,
+    author_skew: float,
+    comment_skew: float,
+    chunk_size: int,
+) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    password = await hash_password(datagen.PASSWORD)
+    last = {}
+
+    def progress(table: str, done: int, elapsed: float) -> None:
+        # 10% 단위로 출력
+        total = {"user": users, "post": posts, "comment": comments}[table]
+        step = done * 10 // total
+        if done == total or step != last.get(table):
+            last[table] = step
+            typer.echo(f"{table}: {done}/{total} ({done / elapsed:,.0f} rows/s)")
+
+    # 연결 설정(PRAGMA 등)이 유지되도록 연결 하나로 생성
+    async with engine.connect() as connection:
+        async with AsyncSession(bind=connection) as session:
+            first_user = datagen.user_id(prefix, 0)
+            if await session.get(User, first_user) is not None:
+                typer.echo(f"{first_user} 유저가 이미 있습니다. --prefix를 바꿔주세요.")
+                raise typer.Exit(code=1)
+            await datagen.generate_data(
+                session,
+                users,
+                posts,
+                comments,
+                seed,
+                prefix,
+                password,
+                author_skew,
+                comment_skew,
+                chunk_size,
+                progress,
+            )
+    await engine.dispose()
+
+
+@app.command()
+def compare_loadtest(
+    base: Path = typer.Argument(
+        ..., exists=True, help="기준 리포트 (locust --report-json)"
+    ),
+    new: Path = typer.Argument(..., exists=True, help="비교할 리포트"),
+    threshold: float = typer.Option(10.0, help="회귀로 판단하는 변화율(%)"),
+) -> None:
+    """
+    부하 테스트 리포트 두 개의 응답 시간 백분위/초당 요청 수/실패율 비교
+    threshold % 이상 나빠진 항목이 있으면 종료 코드 1
+    """
+    # 부하 테스트 도구(benchmarks/)는 이 명령에서만 사용
+    from benchmarks.loadtest import compare_reports
+
+    base_report = json.loads(base.read_text(encoding="utf-8"))
+    new_report = json.loads(new.read_text(encoding="utf-8"))
+    if base_report["scenario"] != new_report["scenario"]:
+        typer.echo(
+            f"시나리오가 다릅니다: {base_report['scenario']} / {new_report['scenario']}"
+        )
+    rows, regressions = compare_reports(base_report, new_report, threshold)
+    for name, metric, old, value, change in rows:
+        typer.echo(f"{name:<45} {metric:<13} {old:>10} -> {value:>10} ({change:+.1f}%)")
+    if regressions:
+        typer.echo(f"회귀 {len(regressions)}건 (기준 {threshold}%)")
+        for regression in regressions:
+            typer.echo(f"  {regression}")
+        raise typer.Exit(code=1)
+    typer.echo("회귀 없음")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,25 +1,60 @@
+import asyncio
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+import orjson
 import yaml
+from fastapi import HTTPException, Request, Response, status
 from fastapi.security import APIKeyHeader
 from jose import jwt
 from passlib.context import CryptContext
+from pydantic import ValidationError
+from sqlalchemy import and_, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from api.api_schema import BulkError
 from config import Settings
 
 api_key_header = APIKeyHeader(name="Authorization")
 
 password_hashing = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 목록 조회 API 한 페이지당 행 개수
+PAGE_SIZE = 100
+
 with open("config.yaml", "r") as file:
     yaml_data = yaml.safe_load(file)
 
-settings = Settings(
-    secret_key=yaml_data.get("secret_key"),
-    algorithm=yaml_data.get("algorithm"),
-    access_token_expire_days=yaml_data.get("access_token_expire_days"),
+# config.yaml에 없는 항목은 Settings 기본값 사용
+settings = Settings(**yaml_data)
+
+# bcrypt 해시/검증 전용 스레드 풀 (bcrypt는 GIL을 해제하므로 스레드로 병렬 처리 가능)
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password"
 )
+_password_semaphore = asyncio.Semaphore(settings.password_hash_workers)
+
+# 비밀번호 작업 현황 (running: 실행 중, waiting: 스레드 풀 대기 중)
+password_stats: Dict[str, int] = {"running": 0, "waiting": 0, "rejected": 0}
+
+T = TypeVar("T")
 
 
 def encode_access_token(data: dict, expires_delta: timedelta) -> str:
@@ -33,10 +68,278 @@ def encode_access_token(data: dict, expires_delta: timedelta) -> str:
 
 
 def verify_password(plain_password, hashed_password) -> bool:
-    password_hashing = CryptContext(schemes=["bcrypt"], deprecated="auto")
     return password_hashing.verify(plain_password, hashed_password)
 
 
+async def hash_password(password: str) -> str:
+    """이벤트 루프를 막지 않도록 스레드 풀에서 비밀번호 해시"""
+    return await _run_password_task(password_hashing.hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """이벤트 루프를 막지 않도록 스레드 풀에서 비밀번호 검증"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def _run_password_task(func: Callable[..., T], *args) -> T:
+    """
+    동시 실행 개수를 password_hash_workers로 제한
+    대기열이 password_hash_queue_limit을 넘으면 503 응답
+    """
+    if password_stats["waiting"] >= settings.password_hash_queue_limit:
+        password_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
+    password_stats["waiting"] += 1
+    try:
+        await _password_semaphore.acquire()
+    finally:
+        password_stats["waiting"] -= 1
+    password_stats["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        password_stats["running"] -= 1
+        _password_semaphore.release()
+
+
 def decode_access_token(token) -> Dict[str, Union[str, int]]:
     decoded_jwt = jwt.decode(token, settings.secret_key, algorithms=settings.algorithm)
     return decoded_jwt
+
+
+def encode_cursor(keys: Tuple) -> str:
+    """페이지 마지막 행의 정렬 키 값들(예: created_at, 기본키)을 불투명한 커서 문자열로 변환"""
+    raw = json.dumps(
+        [key.isoformat() if isinstance(key, datetime) else key for key in keys]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, types: Tuple[Callable, ...]) -> Tuple:
+    """
+    커서 문자열을 정렬 키 값들로 복원
+    types는 키마다 값을 변환할 함수 (예: (datetime.fromisoformat, int))
+    """
+    try:
+        keys = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(keys) != len(types):
+            raise ValueError(cursor)
+        return tuple(convert(key) for convert, key in zip(types, keys))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="커서 값이 올바르지 않습니다.",
+        )
+
+
+def paginate(
+    statement, created_at_column, key_column, page: int, cursor: Optional[str]
+):
+    """
+    목록 조회 쿼리에 페이지 조건 추가
+    커서가 있으면 (created_at, 기본키) 인덱스 탐색으로, 없으면 기존 page(OFFSET) 방식으로 조회
+    """
+    statement = statement.order_by(created_at_column, key_column).limit(PAGE_SIZE)
+    if cursor is None:
+        return statement.offset((page - 1) * PAGE_SIZE)
+    created_at, key = decode_cursor(cursor, (datetime.fromisoformat, int))
+    return statement.where(
+        or_(
+            created_at_column > created_at,
+            and_(created_at_column == created_at, key_column > key),
+        )
+    )
+
+
+def next_cursor(results: List, key_name: str) -> Optional[str]:
+    """다음 페이지가 있을 수 있으면 마지막 행 기준 커서 반환"""
+    if len(results) < PAGE_SIZE:
+        return None
+    last = results[-1]
+    return encode_cursor((last.created_at, getattr(last, key_name)))
+
+
+def parse_fields(fields: Optional[str], columns: Sequence) -> Optional[List[str]]:
+    """
+    쉼표로 구분한 fields 값을 검증해서 응답 필드 순서대로 반환
+    fields 값이 없으면 None (전체 필드)
+    """
+    if fields is None:
+        return None
+    allowed = [column.key for column in columns]
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    if not names or not names <= set(allowed):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields 값은 {', '.join(allowed)} 중에서 선택해야 합니다.",
+        )
+    return [name for name in allowed if name in names]
+
+
+def select_columns(
+    columns: Sequence, fields: Optional[List[str]], *required: str
+) -> List:
+    """fields에 해당하는 컬럼과 페이지 계산에 필요한 컬럼(required)만 조회하도록 선택"""
+    if fields is None:
+        return list(columns)
+    names = set(fields) | set(required)
+    return [column for column in columns if column.key in names]
+
+
+def dump_list(
+    message: str, rows: List, fields: Optional[List[str]] = None, **extra
+) -> bytes:
+    """
+    목록 응답을 DB 조회 결과 행(컬럼 이름 = 응답 필드 이름)에서 바로 JSON으로 변환
+    행마다 Pydantic 모델을 만들고 response_model로 다시 검증하는 과정 생략
+    fields가 있으면 해당 필드만 응답 (페이지 계산용으로만 조회한 컬럼 제외)
+    """
+    # Row._asdict()는 행마다 컬럼 이름을 다시 계산하므로 이름은 한 번만 조회
+    names = list(rows[0]._fields) if rows else []
+    if fields is None:
+        data = [dict(zip(names, row)) for row in rows]
+    else:
+        positions = [names.index(name) for name in fields] if rows else []
+        data = [
+            dict(zip(fields, [row[position] for position in positions])) for row in rows
+        ]
+    return dump_json({"message": message, "data": data, **extra})
+
+
+def dump_json(data: Any) -> bytes:
+    """응답 데이터를 orjson으로 변환 (UTC 시각은 Pydantic과 같이 Z로 표기)"""
+    return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+
+
+def pick_fields(data: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """응답 데이터 하나에서 fields에 해당하는 필드만 남김"""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
+
+
+def wrap_data(message: str, raw: bytes) -> bytes:
+    """이미 JSON으로 변환된 data를 {message, data} 응답 형식으로 감싸기 (다시 파싱하지 않음)"""
+    return orjson.dumps({"message": message})[:-1] + b',"data":' + raw + b"}"
+
+
+def json_response(raw: bytes) -> Response:
+    """이미 JSON으로 변환된 응답 본문을 그대로 응답 (response_model 검증 생략)"""
+    return Response(content=raw, media_type="application/json")
+
+
+def _too_many_bulk_items() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"한 번에 최대 {settings.bulk_max_items}개까지 생성할 수 있습니다.",
+    )
+
+
+async def _read_bulk_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    요청 본문을 받는 대로 나눠서 반환
+    Content-Length 혹은 실제로 받은 크기가 bulk_max_bytes를 넘으면 나머지를 받지 않고 413
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"요청 본문은 최대 {settings.bulk_max_bytes}바이트까지 보낼 수 있습니다.",
+    )
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > settings.bulk_max_bytes:
+        raise too_large
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.bulk_max_bytes:
+            raise too_large
+        yield chunk
+
+
+def _add_ndjson_line(
+    index: int, line: bytes, items: List[Tuple[int, Any]], errors: List[BulkError]
+) -> None:
+    """NDJSON 한 줄을 항목으로 추가, 빈 줄은 건너뜀"""
+    if not line.strip():
+        return
+    if len(items) + len(errors) >= settings.bulk_max_items:
+        raise _too_many_bulk_items()
+    try:
+        items.append((index, json.loads(line)))
+    except ValueError:
+        errors.append(BulkError(index=index, detail="JSON 형식이 아닙니다."))
+
+
+async def parse_bulk_body(
+    request: Request,
+) -> Tuple[List[Tuple[int, Any]], List[BulkError]]:
+    """
+    대량 생성 요청 본문을 (순번, 항목) 목록으로 변환
+    Content-Type이 application/x-ndjson이면 한 줄에 한 항목, 아니면 JSON 배열
+    NDJSON은 받는 대로 줄 단위로 처리하고 순번은 빈 줄을 포함한 줄 번호(0부터)
+    """
+    items: List[Tuple[int, Any]] = []
+    errors: List[BulkError] = []
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        index = 0
+        rest = b""
+        async for chunk in _read_bulk_body(request):
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop()
+            for line in lines:
+                _add_ndjson_line(index, line, items, errors)
+                index += 1
+        _add_ndjson_line(index, rest, items, errors)
+        return items, errors
+    # JSON 배열은 전체를 받은 뒤 파싱 (크기는 bulk_max_bytes로 제한)
+    body = b"".join([chunk async for chunk in _read_bulk_body(request)])
+    try:
+        parsed = json.loads(body)
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="요청 본문은 JSON 배열 혹은 NDJSON이어야 합니다.",
+        )
+    if len(parsed) > settings.bulk_max_items:
+        raise _too_many_bulk_items()
+    return list(enumerate(parsed)), errors
+
+
+def validate_bulk_items(
+    items: List[Tuple[int, Any]], model: Type[T], errors: List[BulkError]
+) -> List[Tuple[int, T]]:
+    """항목별로 검증해서 통과한 항목만 반환, 실패한 항목은 errors에 추가"""
+    valid = []
+    for index, item in items:
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append(BulkError(index=index, detail=detail))
+    return valid
+
+
+def chunked(rows: List[T], size: int):
+    """rows를 size 개씩 나눠서 반환"""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def find_existing(
+    session: AsyncSession, column: Any, values: Sequence[T], chunk_size: int
+) -> Set[T]:
+    """values 중 column에 존재하는 값 (IN 쿼리를 chunk_size 개씩 나눠서 조회)"""
+    existing: Set[T] = set()
+    for chunk in chunked(list(set(values)), chunk_size):
+        existing.update(
+            (await session.exec(select(column).where(column.in_(chunk)))).all()
+        )
+    return existing
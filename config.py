@@ -5,3 +5,25 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_days: int
+    redis_url: str = "redis://localhost:6379"
+    cache_ttl_seconds: int = 60 * 60 * 2
+    local_cache_max_entries: int = 1024
+    local_cache_max_bytes: int = 32 * 1024 * 1024
+    local_cache_ttl_seconds: int = 30
+    cache_stale_seconds: int = 60
+    cache_lock_timeout_ms: int = 3000
+    password_hash_workers: int = 4
+    password_hash_queue_limit: int = 100
+    token_cache_max_entries: int = 10000
+    token_store: str = "redis"
+    token_bloom_capacity: int = 100000
+    token_bloom_error_rate: float = 0.01
+    export_chunk_size: int = 1000
+    bulk_chunk_size: int = 1000
+    bulk_max_items: int = 100000
+    bulk_max_bytes: int = 64 * 1024 * 1024
+    batch_max_ids: int = 100
+    http_max_age: int = 0
+    http_shared_max_age: int = 10
+    compress_min_size: int = 1000
+    compress_level: int = 6
@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import Comment, Counter, Post
+
+
+def post_comment_counter(post_id: int) -> str:
+    """게시글 별 댓글 개수 카운터"""
+    return f"post:{post_id}:comment"
+
+
+def user_post_counter(user_id: str) -> str:
+    """유저별 작성 게시글 개수 카운터"""
+    return f"user:{user_id}:post"
+
+
+def user_comment_counter(user_id: str) -> str:
+    """유저별 작성 댓글 개수 카운터"""
+    return f"user:{user_id}:comment"
+
+
+async def add_counts(session: AsyncSession, deltas: Dict[str, int]) -> None:
+    """
+    카운터 증감 (커밋은 호출한 쪽에서 데이터 변경과 함께)
+    행이 없으면 생성하고, 있으면 현재 값에 더하는 upsert 한 번으로 처리
+    여러 요청이 같은 카운터를 동시에 바꿀 때 교착 상태가 없도록 이름 순서로 갱신
+    """
+    rows = [
+        {"name": name, "value": delta}
+        for name, delta in sorted(deltas.items())
+        if delta != 0
+    ]
+    if rows:
+        await session.execute(_upsert(session.bind.dialect.name), rows)
+
+
+async def get_counts(session: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """카운터 여러 개 조회, 없는 카운터는 0"""
+    names = list(names)
+    results = await session.exec(select(Counter).where(Counter.name.in_(names)))
+    counts = {name: 0 for name in names}
+    counts.update({counter.name: counter.value for counter in results.all()})
+    return counts
+
+
+async def count_actual(session: AsyncSession) -> Dict[str, int]:
+    """원본 테이블을 집계해서 모든 카운터의 실제 값 계산 (전체 조회라 관리 명령에서만 사용)"""
+    counts = {}
+    statement = select(Post.author, func.count()).group_by(Post.author)
+    for user_id, count in (await session.exec(statement)).all():
+        counts[user_post_counter(user_id)] = count
+    statement = select(Comment.post_id, func.count()).group_by(Comment.post_id)
+    for post_id, count in (await session.exec(statement)).all():
+        counts[post_comment_counter(post_id)] = count
+    statement = select(Comment.author_id, func.count()).group_by(Comment.author_id)
+    for user_id, count in (await session.exec(statement)).all():
+        counts[user_comment_counter(user_id)] = count
+    return counts
+
+
+async def reconcile(
+    session: AsyncSession, dry_run: bool = False
+) -> Dict[str, Tuple[int, int]]:
+    """
+    카운터를 실제 값으로 맞추고 달라진 카운터를 (기존 값, 실제 값)으로 반환
+    원본 행이 없는 카운터는 삭제 (실제 값 0)
+    """
+    actual = await count_actual(session)
+    stored = {
+        counter.name: counter.value
+        for counter in (await session.exec(select(Counter))).all()
+    }
+    changed = {
+        name: (stored.get(name, 0), actual.get(name, 0))
+        for name in sorted(stored.keys() | actual.keys())
+        if stored.get(name, 0) != actual.get(name, 0)
+    }
+    if dry_run or not changed:
+        return changed
+    removed = [name for name in changed if name not in actual]
+    if removed:
+        await session.execute(delete(Counter).where(Counter.name.in_(removed)))
+    for name, (_, value) in changed.items():
+        if name in actual:
+            await session.merge(Counter(name=name, value=value))
+    await session.commit()
+    return changed
+
+
+def _upsert(dialect_name: str):
+    if dialect_name == "mysql":
+        statement = mysql.insert(Counter)
+        return statement.on_duplicate_key_update(
+            value=Counter.value + statement.inserted.value
+        )
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = insert(Counter)
+    return statement.on_conflict_do_update(
+        index_elements=[Counter.name],
+        set_={"value": Counter.value + statement.excluded.value},
+    )
@@ -1,19 +1,27 @@
+import logging
 import os
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import List
+from typing import AsyncGenerator, Dict, Iterator, List, Optional, Tuple
 
 from dogpile.cache import make_region
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import Index, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-
-class AuthToken(SQLModel, table=True):
-    __tablename__ = "auth_token"
-    idx: int = Field(primary_key=True)
-    token: str
+logger = logging.getLogger(__name__)
 
 
 class Post(SQLModel, table=True):
+    # 게시글 목록(created_at 순)과 유저별 게시글 목록 조회용 인덱스
+    __table_args__ = (
+        Index("ix_post_created_at", "created_at", "post_id"),
+        Index("ix_post_author_created_at", "author", "created_at", "post_id"),
+    )
     post_id: int = Field(default=None, primary_key=True)
     author: str = Field(foreign_key="user.user_id")
     title: str
@@ -34,6 +42,11 @@ class User(SQLModel, table=True):
 
 
 class Comment(SQLModel, table=True):
+    # 게시글별 댓글 목록과 유저별 댓글 목록 조회용 인덱스
+    __table_args__ = (
+        Index("ix_comment_post_id_created_at", "post_id", "created_at", "com_id"),
+        Index("ix_comment_author_id_created_at", "author_id", "created_at", "com_id"),
+    )
     com_id: int = Field(default=None, primary_key=True)
     author_id: str = Field(default=None, foreign_key="user.user_id")
     post_id: int = Field(default=None, foreign_key="post.post_id")
@@ -43,6 +56,23 @@ class Comment(SQLModel, table=True):
     )
 
 
+# 목록 조회 응답(api_schema.Content, CommentContent)에 필요한 컬럼만 조회할 때 사용
+POST_COLUMNS = (Post.post_id, Post.author, Post.title, Post.content, Post.created_at)
+COMMENT_COLUMNS = (
+    Comment.com_id,
+    Comment.author_id,
+    Comment.post_id,
+    Comment.content,
+    Comment.created_at,
+)
+
+
+class Counter(SQLModel, table=True):
+    # 목록 전체 개수를 COUNT 조회 없이 응답하기 위한 비정규화 카운터 (counter.py 참고)
+    name: str = Field(primary_key=True)
+    value: int = Field(default=0)
+
+
 class Relationship(SQLModel):
     posts: List["Post"] = Relationship(back_populates="post", link_model=Post)
     users: List["User"] = Relationship(back_populates="user", link_model=User)
@@ -57,4 +87,141 @@ sqlite_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///post.db")
 if os.getenv("TEST_ENV") == "true":
     sqlite_url = "sqlite+aiosqlite:///test.db"
 
-engine = create_async_engine(sqlite_url, echo=True, pool_size=10, max_overflow=20)
+# 쿼리 로그 설정
+# DB_ECHO: 모든 SQL 출력 (개발용, 동기 출력이라 부하 시 처리량 감소)
+# DB_SLOW_QUERY_MS: 실행 시간이 이 값(ms) 이상인 쿼리만 경고 로그
+# DB_DEBUG: 요청 하나에서 같은 SQL을 N_PLUS_ONE_THRESHOLD번 이상 실행하면 N+1 의심 경고 로그
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+DEBUG = os.getenv("DB_DEBUG", "false") == "true"
+N_PLUS_ONE_THRESHOLD = 5
+
+# 커넥션 풀 설정 (pool_recycle: 초 단위, DB 서버의 유휴 연결 종료 시간보다 짧게 설정)
+engine = create_async_engine(
+    sqlite_url,
+    echo=os.getenv("DB_ECHO", "false") == "true",
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true") == "true",
+)
+
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# 커넥션 풀 사용 현황 (connects: 새 연결 생성 횟수, checkouts: 풀에서 연결을 꺼낸 횟수)
+pool_stats: Dict[str, int] = {"connects": 0, "checkouts": 0}
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats["connects"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats["checkouts"] += 1
+
+
+class QueryStats:
+    """
+    요청 하나에서 실행한 DB 쿼리 횟수와 실행 시간(초) 합계
+    DB_DEBUG이면 N+1 확인용으로 SQL별 실행 횟수도 기록
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[StatementCounter] = (
+            StatementCounter() if DEBUG else None
+        )
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """N_PLUS_ONE_THRESHOLD번 이상 반복 실행한 (SQL, 횟수) 목록"""
+        if self.statements is None:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+
+# 요청 밖(시작/종료 작업 등)에서 실행한 쿼리는 None이라 집계 안 함
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def track_queries(path: str) -> Iterator[QueryStats]:
+    """
+    이 안에서 실행한 쿼리를 QueryStats 하나로 집계
+    이미 집계 중이면(바깥 미들웨어) 같은 QueryStats를 함께 사용
+    """
+    queries = request_queries.get()
+    if queries is not None:
+        yield queries
+        return
+    queries = QueryStats(path)
+    token = request_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        request_queries.reset(token)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    queries = request_queries.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += elapsed
+        if queries.statements is not None:
+            queries.statements[statement] += 1
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        # 파라미터에는 비밀번호 해시 등이 있을 수 있으므로 SQL만 기록
+        logger.warning(
+            "slow query: %.1fms %s",
+            elapsed_ms,
+            statement,
+            extra={
+                "duration_ms": round(elapsed_ms, 1),
+                "statement": statement,
+                "executemany": executemany,
+                "path": queries.path if queries is not None else None,
+            },
+        )
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _on_query_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각만 제거
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """요청마다 커넥션 풀에서 연결을 가져오는 세션 생성, 요청이 끝나면 반납"""
+    async with async_session() as session:
+        yield session
+
+
+def get_pool_status() -> Dict[str, int]:
+    """현재 커넥션 풀 상태와 누적 연결 생성/사용 횟수"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **pool_stats,
+    }
@@ -0,0 +1,275 @@
+"""
+대량 테스트 데이터 생성 (python cli.py generate-data)
+같은 시드와 옵션이면 같은 데이터 생성, 전체 데이터를 메모리에 만들지 않고 chunk 단위로 생성/INSERT
+- 게시글 작성자 : 소수 유저가 대부분의 게시글을 작성 (거듭제곱 법칙)
+- 댓글 : 소수 인기 게시글에 댓글이 몰림 (거듭제곱 법칙)
+"""
+
+import math
+import random
+import time
+from collections import Counter as DeltaCounter
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Callable, Dict, Iterator, List
+
+from sqlalchemy import func, insert, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from counter import (
+    add_counts,
+    post_comment_counter,
+    user_comment_counter,
+    user_post_counter,
+)
+from database import Comment, Post, User
+
+# 생성 데이터 시각 범위 (시드가 같으면 실행 시각과 상관없이 같은 데이터)
+START_TIME = datetime(2023, 1, 1, tzinfo=timezone.utc)
+END_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# seed-loadtest로 생성하는 부하 테스트 유저 (유저 번호 0 ~ users-1)
+# 비밀번호는 generate-data로 생성하는 유저도 같음
+LOADTEST_PREFIX = "loadtest"
+LOADTEST_USERS = 100
+PASSWORD = "Loadtest1234"
+
+# 게시글 제목/내용, 검색어, 자동완성 접두사에 함께 쓰는 단어 목록
+WORDS = [
+    "가입인사",
+    "공지사항",
+    "질문",
+    "답변",
+    "후기",
+    "추천",
+    "fastapi",
+    "python",
+    "database",
+    "cache",
+    "성능",
+    "배포",
+    "서버",
+    "테스트",
+    "리뷰",
+    "모임",
+]
+
+
+class PowerLaw:
+    """
+    0 ~ n-1 번호를 순위 k의 확률이 1/k^exponent에 비례하도록 뽑기
+    역누적분포로 바로 계산해서 n이 커도 가중치 표를 만들지 않음
+    순위 -> 번호는 시드로 정한 순열이라 인기 유저/게시글이 앞 번호에 몰리지 않음
+    """
+
+    def __init__(self, n: int, exponent: float, rng: random.Random) -> None:
+        self.n = n
+        self.exponent = exponent
+        self.rng = rng
+        # gcd(multiplier, n) == 1이면 rank * multiplier + offset (mod n)은 0 ~ n-1의 순열
+        self.multiplier = rng.randrange(1, max(n, 2)) | 1
+        while math.gcd(self.multiplier, n) != 1:
+            self.multiplier += 2
+        self.offset = rng.randrange(n)
+
+    def sample(self) -> int:
+        u = self.rng.random()
+        if self.exponent == 0:
+            rank = int(u * self.n)
+        elif self.exponent == 1:
+            rank = int((self.n + 1) ** u) - 1
+        else:
+            power = 1 - self.exponent
+            rank = int((((self.n + 1) ** power - 1) * u + 1) ** (1 / power)) - 1
+        rank = min(rank, self.n - 1)
+        return (rank * self.multiplier + self.offset) % self.n
+
+
+class TextPool:
+    """
+    단어를 무작위로 이어 붙인 긴 문자열을 단어 경계로 잘라 제목/내용 생성
+    행마다 단어를 골라 붙이는 대신 문자열 자르기 한 번으로 처리
+    """
+
+    def __init__(self, rng: random.Random, size: int = 100000) -> None:
+        self.rng = rng
+        words = rng.choices(WORDS, k=size)
+        self.text = " ".join(words)
+        # 단어별 시작 위치 (마지막 값은 문자열 끝 + 1)
+        self.starts = list(accumulate((len(word) + 1 for word in words), initial=0))
+
+    def sentence(self, low: int, high: int) -> str:
+        """low ~ high 단어 문장"""
+        count = low + int(self.rng.random() * (high - low + 1))
+        start = int(self.rng.random() * (len(self.starts) - count))
+        return self.text[self.starts[start] : self.starts[start + count] - 1]
+
+
+def user_id(prefix: str, number: int) -> str:
+    return f"{prefix}{number:08d}"
+
+
+def loadtest_user_id(number: int) -> str:
+    return f"{LOADTEST_PREFIX}{number:05d}"
+
+
+def spread(number: int, count: int) -> datetime:
+    """0 ~ count-1 번째 행의 생성 시각 (START_TIME ~ END_TIME 사이에 고르게)"""
+    return START_TIME + (END_TIME - START_TIME) * (number / max(count, 1))
+
+
+def generate_users(
+    count: int, prefix: str, password: str, chunk_size: int
+) -> Iterator[List[Dict]]:
+    """유저 행 chunk (비밀번호 해시는 모두 같은 값)"""
+    for start in range(0, count, chunk_size):
+        yield [
+            {
+                "user_id": user_id(prefix, number),
+                "password": password,
+                "nickname": user_id(prefix, number),
+                "role": "member",
+                "created_at": START_TIME,
+            }
+            for number in range(start, min(start + chunk_size, count))
+        ]
+
+
+def generate_posts(
+    texts: TextPool,
+    count: int,
+    first_id: int,
+    authors: PowerLaw,
+    prefix: str,
+    chunk_size: int,
+) -> Iterator[List[Dict]]:
+    """게시글 행 chunk (게시글 번호 순서대로 생성 시각 증가)"""
+    for start in range(0, count, chunk_size):
+        yield [
+            {
+                "post_id": first_id + number,
+                "author": user_id(prefix, authors.sample()),
+                "title": texts.sentence(2, 5),
+                "content": texts.sentence(10, 60),
+                "created_at": spread(number, count),
+            }
+            for number in range(start, min(start + chunk_size, count))
+        ]
+
+
+def generate_comments(
+    rng: random.Random,
+    texts: TextPool,
+    count: int,
+    first_id: int,
+    posts: PowerLaw,
+    first_post_id: int,
+    post_count: int,
+    authors: PowerLaw,
+    prefix: str,
+    chunk_size: int,
+) -> Iterator[List[Dict]]:
+    """댓글 행 chunk (댓글 생성 시각은 게시글 생성 이후)"""
+    for start in range(0, count, chunk_size):
+        rows = []
+        for number in range(start, min(start + chunk_size, count)):
+            post_number = posts.sample()
+            posted_at = spread(post_number, post_count)
+            rows.append(
+                {
+                    "com_id": first_id + number,
+                    "author_id": user_id(prefix, authors.sample()),
+                    "post_id": first_post_id + post_number,
+                    "content": texts.sentence(3, 20),
+                    "created_at": posted_at + (END_TIME - posted_at) * rng.random(),
+                }
+            )
+        yield rows
+
+
+async def generate_data(
+    session: AsyncSession,
+    users: int,
+    posts: int,
+    comments: int,
+    seed: int,
+    prefix: str,
+    password: str,
+    author_skew: float,
+    comment_skew: float,
+    chunk_size: int,
+    progress: Callable[[str, int, float], None],
+) -> None:
+    """
+    유저 -> 게시글 -> 댓글 순서로 chunk마다 INSERT, 카운터 갱신 후 커밋
+    ORM 객체 변환 없이 테이블 INSERT (executemany)로 처리
+    게시글/댓글 번호는 기존 최대 번호 다음부터 직접 지정 (댓글이 참조할 게시글 번호를 조회 없이 계산)
+    progress : (테이블 이름, 누적 행 수, 경과 초) 진행 상황 출력
+    """
+    rng = random.Random(seed)
+    texts = TextPool(rng)
+    await _disable_checks(session)
+    first_post_id = (await session.exec(select(func.max(Post.post_id)))).one() or 0
+    first_com_id = (await session.exec(select(func.max(Comment.com_id)))).one() or 0
+    authors = PowerLaw(users, author_skew, rng)
+    hot_posts = PowerLaw(max(posts, 1), comment_skew, rng)
+    commenters = PowerLaw(users, author_skew, rng)
+
+    started = time.perf_counter()
+    done = 0
+    for chunk in generate_users(users, prefix, password, chunk_size):
+        await session.execute(insert(User.__table__), chunk)
+        await session.commit()
+        done += len(chunk)
+        progress("user", done, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    done = 0
+    chunks = generate_posts(
+        texts, posts, first_post_id + 1, authors, prefix, chunk_size
+    )
+    for chunk in chunks:
+        await session.execute(insert(Post.__table__), chunk)
+        deltas = DeltaCounter(user_post_counter(row["author"]) for row in chunk)
+        await add_counts(session, deltas)
+        await session.commit()
+        done += len(chunk)
+        progress("post", done, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    done = 0
+    chunks = generate_comments(
+        rng,
+        texts,
+        comments if posts else 0,
+        first_com_id + 1,
+        hot_posts,
+        first_post_id + 1,
+        posts,
+        commenters,
+        prefix,
+        chunk_size,
+    )
+    for chunk in chunks:
+        await session.execute(insert(Comment.__table__), chunk)
+        deltas = DeltaCounter()
+        for row in chunk:
+            deltas[post_comment_counter(row["post_id"])] += 1
+            deltas[user_comment_counter(row["author_id"])] += 1
+        await add_counts(session, deltas)
+        await session.commit()
+        done += len(chunk)
+        progress("comment", done, time.perf_counter() - started)
+
+
+async def _disable_checks(session: AsyncSession) -> None:
+    """
+    생성 중인 연결에서만 쓰기 부하를 줄이는 설정 (번호를 직접 지정하므로 중복/참조 오류 없음)
+    SQLite : 커밋마다 디스크 동기화 생략, MySQL : 고유/외래 키 검사 생략
+    """
+    dialect_name = session.bind.dialect.name
+    if dialect_name == "sqlite":
+        await session.execute(text("PRAGMA synchronous = OFF"))
+    elif dialect_name == "mysql":
+        await session.execute(text("SET unique_checks = 0, foreign_key_checks = 0"))
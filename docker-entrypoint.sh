@@ -0,0 +1,10 @@
+#!/bin/sh
+set -e
+
+# 워커별 지표 파일이 이전 실행 값과 섞이지 않도록 서버 시작 전에 디렉터리를 비움
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"
@@ -1,45 +1,325 @@
-from locust import HttpUser, task
-
-
-class APITestUser(HttpUser):
-
-    # @task
-    # def hello(self):
-    #     self.client.get("/")
-
-    # 게시물 가져오는 엔드포인트
-    @task
-    def get_post(self):
-        self.client.get("/api/posts/?page=1")
-
-    # def create_user(self):
-    #     data = {
-    #         "user_id": "testuser",
-    #         "password": "A1234567890",
-    #         "nickname": "testnick",
-    #     }
-    #     self.client.post("/api/users/", json=data)
-
-    # def login_user(self):
-    #     data = {"user_id": "testuser", "password": "A1234567890"}
-    #     with self.client.post(
-    #         "/api/users/login", json=data, catch_response=True
-    #     ) as response:
-    #         if response.status_code == 200:
-    #             res_data = json.loads(response.text)
-    #             self.token = res_data["access_token"]
-
-    # @task
-    # def get_user_posts(self):
-    #     headers = {"Authorization": f"{self.token}"}
-    #     self.client.get("/api/users/testuser/posts/?page=1", headers=headers)
-
-    # @task
-    # def get_user_comments(self):
-    #     headers = {"Authorization": f"{self.token}"}
-    #     self.client.get("/api/users/testuser/comments/?page=1", headers=headers)
-
-    # @task
-    # def delete_user(self):
-    #     headers = {"Authorization": f"{self.token}"}
-    #     self.client.delete("/api/users/testuser", headers=headers)
+"""
+부하 테스트 시나리오 (실행 방법은 README 참고)
+실행 전 python cli.py seed-loadtest로 테스트 유저/게시글/댓글 생성
+생성 데이터와 같은 값(datagen.py)을 쓰므로 서버와 같은 환경(config.yaml)에서 실행
+
+- ReadHeavyUser : 게시글 목록/조회/댓글/검색/자동완성 위주
+- WriteHeavyUser : 로그인 후 게시글/댓글 작성, 수정, 삭제 위주
+- LoginStormUser : 로그인/로그아웃 반복 (비밀번호 검증 부하)
+- DeepPaginationUser : 커서/페이지 번호로 깊은 페이지까지 목록 조회
+- MixedUser : 위 시나리오를 실제 사용 비율에 가깝게 섞은 조합
+"""
+
+import itertools
+import json
+import random
+from typing import Callable, Dict, List, Optional
+
+from locust import HttpUser, between, events
+from locust.runners import WorkerRunner
+
+from benchmarks.loadtest import build_report
+from datagen import LOADTEST_USERS, PASSWORD, WORDS, loadtest_user_id
+
+# 가상 유저마다 다른 난수 시드를 주기 위한 번호
+_user_numbers = itertools.count()
+
+# 가상 유저 하나가 기억하는 게시글 번호 최대 개수
+MAX_KNOWN_POSTS = 200
+
+# DeepPaginationUser가 커서로 따라가는 최대 페이지 수
+MAX_CURSOR_PAGES = 50
+
+
+@events.init_command_line_parser.add_listener
+def _add_arguments(parser) -> None:
+    parser.add_argument(
+        "--report-json", default="", help="결과 리포트를 저장할 JSON 파일 경로"
+    )
+    parser.add_argument(
+        "--random-seed", type=int, default=0, help="가상 유저별 난수 시드"
+    )
+    parser.add_argument(
+        "--seed-users",
+        type=int,
+        default=LOADTEST_USERS,
+        help="seed-loadtest로 생성한 유저 수",
+    )
+
+
+@events.quitting.add_listener
+def _write_report(environment, **kwargs) -> None:
+    path = environment.parsed_options.report_json
+    # 분산 실행 시에는 master에서만 저장
+    if not path or isinstance(environment.runner, WorkerRunner):
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(build_report(environment), file, ensure_ascii=False, indent=2)
+
+
+class LoadTestUser(HttpUser):
+    abstract = True
+    wait_time = between(0.5, 2)
+
+    def on_start(self) -> None:
+        options = self.environment.parsed_options
+        self.random = random.Random(f"{options.random_seed}:{next(_user_numbers)}")
+        self.user_id = loadtest_user_id(self.random.randrange(options.seed_users))
+        self.token: Optional[str] = None
+        self.post_ids: List[int] = []
+        self.next_cursor: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.token is None:
+            self.login()
+        return {"Authorization": self.token or ""}
+
+    def login(self) -> None:
+        with self.client.post(
+            "/api/users/login",
+            json={"user_id": self.user_id, "password": PASSWORD},
+            catch_response=True,
+        ) as response:
+            if response.status_code == 200:
+                self.token = response.json()["access_token"]
+            else:
+                response.failure(f"login failed: {response.status_code}")
+
+    def logout(self) -> None:
+        if self.token is None:
+            return
+        self.client.post("/api/users/logout", headers={"Authorization": self.token})
+        self.token = None
+
+    def read_list(self, response) -> None:
+        """목록 응답의 게시글 번호와 다음 페이지 커서 기억"""
+        if response.status_code != 200:
+            return
+        body = response.json()
+        self.next_cursor = body.get("next_cursor")
+        self.post_ids.extend(data["post_id"] for data in body["data"])
+        del self.post_ids[:-MAX_KNOWN_POSTS]
+
+    def pick_post(self) -> Optional[int]:
+        if not self.post_ids:
+            view_feed(self)
+        if not self.post_ids:
+            return None
+        return self.random.choice(self.post_ids)
+
+
+def weighted(*scenarios: Dict[Callable, int], shares: List[int]) -> Dict[Callable, int]:
+    """시나리오별 작업 가중치를 shares 비율(합 100)로 맞춰서 하나로 합침"""
+    tasks = {}
+    for scenario, share in zip(scenarios, shares):
+        total = sum(scenario.values())
+        for func, weight in scenario.items():
+            tasks[func] = max(1, round(weight * share / total))
+    return tasks
+
+
+# 읽기 작업
+def view_feed(user: LoadTestUser) -> None:
+    user.read_list(user.client.get("/api/posts/?page=1", name="/api/posts/"))
+
+
+def view_next_page(user: LoadTestUser) -> None:
+    if user.next_cursor is None:
+        view_feed(user)
+        return
+    response = user.client.get(
+        "/api/posts/", params={"cursor": user.next_cursor}, name="/api/posts/?cursor"
+    )
+    user.read_list(response)
+
+
+def view_feed_fields(user: LoadTestUser) -> None:
+    response = user.client.get(
+        "/api/posts/?page=1&fields=post_id,title,author", name="/api/posts/?fields"
+    )
+    user.read_list(response)
+
+
+def get_post(user: LoadTestUser, url: str, name: str) -> None:
+    # 다른 가상 유저가 삭제한 게시글일 수 있으므로 404는 성공으로 기록
+    with user.client.get(url, name=name, catch_response=True) as response:
+        if response.status_code == 404:
+            response.success()
+
+
+def view_post(user: LoadTestUser) -> None:
+    post_id = user.pick_post()
+    if post_id is not None:
+        get_post(user, f"/api/posts/{post_id}", "/api/posts/{post_id}")
+
+
+def view_post_with_comments(user: LoadTestUser) -> None:
+    post_id = user.pick_post()
+    if post_id is not None:
+        get_post(
+            user,
+            f"/api/posts/{post_id}?include=comments,comment_count",
+            "/api/posts/{post_id}?include",
+        )
+
+
+def view_comments(user: LoadTestUser) -> None:
+    post_id = user.pick_post()
+    if post_id is not None:
+        user.client.get(
+            f"/api/posts/{post_id}/comments/?page=1",
+            name="/api/posts/{post_id}/comments/",
+        )
+
+
+def search(user: LoadTestUser) -> None:
+    user.client.get(
+        "/api/posts/search",
+        params={"q": user.random.choice(WORDS)},
+        name="/api/posts/search",
+    )
+
+
+def autocomplete(user: LoadTestUser) -> None:
+    prefix = user.random.choice(WORDS)[:2]
+    # 색인 준비 전 503은 실패로 기록
+    user.client.get(
+        "/api/posts/autocomplete", params={"q": prefix}, name="/api/posts/autocomplete"
+    )
+
+
+# 쓰기 작업
+def create_post(user: LoadTestUser) -> None:
+    words = user.random.sample(WORDS, 3)
+    user.client.post(
+        "/api/posts/",
+        json={
+            "author": user.user_id,
+            "title": " ".join(words[:2]),
+            "content": " ".join(words) * 10,
+        },
+        headers=user.headers,
+    )
+
+
+def create_comment(user: LoadTestUser) -> None:
+    post_id = user.pick_post()
+    if post_id is None:
+        return
+    user.client.post(
+        "/api/comments/",
+        json={
+            "author_id": user.user_id,
+            "post_id": post_id,
+            "content": user.random.choice(WORDS),
+        },
+    )
+
+
+def view_own_posts(user: LoadTestUser) -> Optional[List[int]]:
+    response = user.client.get(
+        f"/api/users/{user.user_id}/posts/?page=1",
+        headers=user.headers,
+        name="/api/users/{user_id}/posts/",
+    )
+    if response.status_code != 200:
+        return None
+    return [data["post_id"] for data in response.json()["data"]]
+
+
+def edit_own_post(user: LoadTestUser) -> None:
+    own_posts = view_own_posts(user)
+    if not own_posts:
+        return
+    user.client.put(
+        f"/api/posts/{user.random.choice(own_posts)}",
+        json={
+            "author": user.user_id,
+            "title": " ".join(user.random.sample(WORDS, 2)),
+            "content": " ".join(user.random.sample(WORDS, 3)),
+        },
+        headers=user.headers,
+        name="/api/posts/{post_id}",
+    )
+
+
+def delete_own_post(user: LoadTestUser) -> None:
+    own_posts = view_own_posts(user)
+    if not own_posts:
+        return
+    post_id = user.random.choice(own_posts)
+    user.client.delete(
+        f"/api/posts/{post_id}", headers=user.headers, name="/api/posts/{post_id}"
+    )
+    if post_id in user.post_ids:
+        user.post_ids.remove(post_id)
+
+
+# 로그인 작업
+def login_logout(user: LoadTestUser) -> None:
+    user.login()
+    user.logout()
+
+
+# 페이지 이동 작업
+def follow_cursor(user: LoadTestUser) -> None:
+    view_feed(user)
+    for _ in range(user.random.randrange(1, MAX_CURSOR_PAGES)):
+        if user.next_cursor is None:
+            break
+        view_next_page(user)
+
+
+def view_deep_page(user: LoadTestUser) -> None:
+    page = user.random.randrange(2, MAX_CURSOR_PAGES)
+    user.client.get(f"/api/posts/?page={page}", name="/api/posts/?page=N")
+
+
+FEED_TASKS = {
+    view_feed: 10,
+    view_next_page: 3,
+    view_feed_fields: 1,
+    view_post: 15,
+    view_post_with_comments: 5,
+    view_comments: 6,
+    search: 2,
+    autocomplete: 3,
+}
+POSTING_TASKS = {
+    create_post: 5,
+    create_comment: 5,
+    view_own_posts: 2,
+    edit_own_post: 2,
+    delete_own_post: 1,
+}
+LOGIN_TASKS = {login_logout: 1}
+PAGINATION_TASKS = {follow_cursor: 1, view_deep_page: 1}
+
+
+class ReadHeavyUser(LoadTestUser):
+    tasks = FEED_TASKS
+
+
+class WriteHeavyUser(LoadTestUser):
+    tasks = POSTING_TASKS
+
+
+class LoginStormUser(LoadTestUser):
+    tasks = LOGIN_TASKS
+    wait_time = between(0, 0.5)
+
+
+class DeepPaginationUser(LoadTestUser):
+    tasks = PAGINATION_TASKS
+
+
+class MixedUser(LoadTestUser):
+    # 읽기 80%, 쓰기 10%, 깊은 페이지 7%, 로그인 3%
+    tasks = weighted(
+        FEED_TASKS,
+        POSTING_TASKS,
+        PAGINATION_TASKS,
+        LOGIN_TASKS,
+        shares=[80, 10, 7, 3],
+    )
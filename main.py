@@ -1,52 +1,105 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response, status
 from fastapi.responses import RedirectResponse
-from redis import asyncio as aioredis
-from redis.asyncio import Redis
 
-from api import comment, post, user
-from database import SQLModel, engine
+import autocomplete
+import cache
+import metrics
+import responses
+from api import comment, export, post, user
+from common import password_stats, settings
+from database import SQLModel, engine, get_pool_status
 
-SQLModel.metadata.create_all(engine)
 app = FastAPI()
 
+# 캐시된 조회 응답은 responses.conditional_response에서 미리 압축하고, 나머지 응답은 요청마다 gzip 압축
+# (이미 Content-Encoding이 있는 응답은 다시 압축하지 않음)
+app.add_middleware(
+    responses.GZipMiddleware,
+    minimum_size=settings.compress_min_size,
+    compresslevel=settings.compress_level,
+)
+
+# 요청별 DB 쿼리 횟수/시간을 Server-Timing 헤더로 응답
+app.add_middleware(responses.ServerTimingMiddleware)
+
+# 라우트별 요청 수/응답 시간 기록 (압축 시간까지 포함하도록 가장 바깥에 추가)
+if metrics.enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 
 @app.get("/", response_class=RedirectResponse)
 async def index():
     return "/docs"
 
 
-@app.on_event("startup")
-async def startup_event() -> Redis:
-    # aioredis 연결 생성
-    app.redis = await aioredis.from_url("redis://localhost:6379")
-    return app.redis
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    캐시 적중/미스 횟수 조회 (워커 프로세스 단위)
+    """
+    return {
+        **cache.stats,
+        "local_entries": len(cache.local_cache),
+        "local_bytes": cache.local_cache.size,
+        **responses.compression_stats,
+        "compressed_entries": len(responses.compressed_cache),
+        "compressed_bytes": responses.compressed_cache.size,
+    }
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    # aioredis 연결 종료
-    app.redis.close()
-    await app.redis.wait_closed()
+@app.get("/password/stats")
+async def get_password_stats():
+    """
+    비밀번호 해시/검증 스레드 풀 실행/대기 현황 조회 (워커 프로세스 단위)
+    """
+    return password_stats
 
 
-async def get_cached_query_result(query):
-    cache_key = str(query)  # 쿼리를 기반으로 고유 키 생성
-    cached_result = await app.redis.get(cache_key)
+@app.get("/db/pool")
+async def get_db_pool_status():
+    """
+    DB 커넥션 풀 사용 현황 조회 (워커 프로세스 단위)
+    """
+    return get_pool_status()
 
-    if cached_result is not None:
-        return cached_result  # 캐시된 결과 반환
-    else:
-        result = await execute_query(query)  # 데이터베이스 쿼리 실행
-        await app.redis.set(cache_key, result, ex=60 * 60 * 2)  # 결과를 2시간 동안 캐싱
-        return result
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    prometheus 수집용 지표 (다중 프로세스 모드면 모든 워커 합산)
+    """
+    if not metrics.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="prometheus_client 패키지가 설치되지 않았습니다.",
+        )
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
-async def execute_query(query):
-    async with engine.connect() as connection:
-        result = await connection.execute(query)
-        return result.fetchall()
+
+@app.on_event("startup")
+async def startup_event():
+    # 테이블 생성
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    # 다른 워커의 캐시 무효화 메시지 구독
+    await cache.start_invalidation_listener()
+    # 게시글 제목 자동완성 색인 생성 (백그라운드)
+    autocomplete.start_build()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 캐시 무효화 구독 종료 및 redis 연결 종료
+    await cache.stop_invalidation_listener()
+    await autocomplete.stop_build()
+    await cache.redis.aclose()
+    # 커넥션 풀 연결 종료
+    await engine.dispose()
+    metrics.mark_process_dead()
 
 
 app.include_router(post.router)
 app.include_router(user.router)
 app.include_router(comment.router)
+app.include_router(export.router)
@@ -0,0 +1,155 @@
+import os
+import time
+from typing import Dict, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import cache
+import responses
+from database import track_queries
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # 선택 패키지, 없으면 /metrics 비활성화
+    prometheus_client = None
+
+enabled = prometheus_client is not None
+
+# 여러 워커 프로세스(uvicorn --workers) 실행 시 워커별 값을 파일로 기록해서 /metrics에서 합산
+# 서버 시작 전에 비어 있는 디렉터리로 설정해야 함 (prometheus_client 다중 프로세스 모드)
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# 요청 하나에서 실행한 DB 쿼리 횟수 구간
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+if enabled:
+    REQUESTS = prometheus_client.Counter(
+        "http_requests_total",
+        "라우트별 요청 수",
+        ["method", "route", "status"],
+    )
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "http_request_duration_seconds",
+        "라우트별 응답 시간",
+        ["method", "route"],
+    )
+    REQUESTS_IN_PROGRESS = prometheus_client.Gauge(
+        "http_requests_in_progress",
+        "라우트별 처리 중인 요청 수",
+        ["method", "route"],
+        multiprocess_mode="livesum",
+    )
+    DB_QUERIES = prometheus_client.Histogram(
+        "db_queries_per_request",
+        "요청 하나에서 실행한 DB 쿼리 수",
+        ["route"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+    DB_QUERY_TIME = prometheus_client.Histogram(
+        "db_query_duration_seconds_per_request",
+        "요청 하나에서 실행한 DB 쿼리 시간 합계",
+        ["route"],
+    )
+    CACHE_EVENTS = prometheus_client.Counter(
+        "cache_events_total",
+        "조회 캐시 적중/미스 횟수 (cache.stats)",
+        ["result"],
+    )
+    COMPRESSION_EVENTS = prometheus_client.Counter(
+        "response_compression_total",
+        "캐시 응답 압축/압축 결과 재사용 횟수 (responses.compression_stats)",
+        ["result"],
+    )
+
+# 마지막으로 prometheus 카운터에 반영한 워커 통계 값
+_synced: Dict[Tuple[str, str], int] = {}
+
+
+class MetricsMiddleware:
+    """
+    요청마다 라우트별 요청 수, 응답 시간, 처리 중인 요청 수, DB 쿼리 수/시간 기록
+    라벨은 요청 경로 대신 라우트 경로 템플릿 (/api/posts/{post_id})
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = route_name(scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        with track_queries(scope["path"]) as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - start
+                in_progress.dec()
+                REQUESTS.labels(method, route, str(status_code)).inc()
+                REQUEST_LATENCY.labels(method, route).observe(elapsed)
+                DB_QUERIES.labels(route).observe(queries.count)
+                DB_QUERY_TIME.labels(route).observe(queries.seconds)
+                sync_stats()
+
+
+def route_name(scope: Scope) -> str:
+    """요청에 해당하는 라우트 경로 (게시글 번호 등 경로 값마다 라벨이 늘어나지 않도록)"""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+def sync_stats() -> None:
+    """
+    워커 통계(cache.stats, responses.compression_stats)의 증가분을 prometheus 카운터에 반영
+    백그라운드 캐시 갱신처럼 요청 밖에서 바뀐 값은 다음 요청 때 반영
+    """
+    for source, counter, stats in (
+        ("cache", CACHE_EVENTS, cache.stats),
+        ("compression", COMPRESSION_EVENTS, responses.compression_stats),
+    ):
+        for name, value in stats.items():
+            key = (source, name)
+            delta = value - _synced.get(key, 0)
+            if delta > 0:
+                counter.labels(name).inc(delta)
+            _synced[key] = value
+
+
+def render() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type (다중 프로세스 모드면 모든 워커 값을 합산)"""
+    sync_stats()
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return (
+        prometheus_client.generate_latest(registry),
+        prometheus_client.CONTENT_TYPE_LATEST,
+    )
+
+
+def mark_process_dead() -> None:
+    """종료하는 워커의 처리 중인 요청 수(livesum) 기록 제거"""
+    if enabled and os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
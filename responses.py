@@ -0,0 +1,190 @@
+import gzip
+import hashlib
+import logging
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response, status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware import gzip as starlette_gzip
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import LocalCache
+from common import settings
+from database import track_queries
+
+try:
+    import brotli
+except ImportError:  # 선택 패키지, 없으면 gzip만 사용
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트가 같은 우선순위로 허용하면 앞쪽 압축 방식 사용
+ENCODINGS: List[str] = (["br"] if brotli is not None else []) + ["gzip"]
+
+# 압축한 응답 본문 (키: 본문 해시, field: 압축 방식)
+# 본문 해시가 키라서 데이터가 바뀌면 새 키로 저장되므로 무효화가 필요 없음
+compressed_cache = LocalCache(
+    max_entries=settings.local_cache_max_entries,
+    max_bytes=settings.local_cache_max_bytes,
+    ttl_seconds=settings.cache_ttl_seconds,
+)
+
+compression_stats: Dict[str, int] = {"compressed": 0, "reused": 0}
+
+
+def conditional_response(
+    request: Request, body: bytes, modified_at: Optional[float] = None
+) -> Response:
+    """
+    JSON 응답에 ETag(본문 해시), Last-Modified, Cache-Control 헤더 추가
+    요청의 If-None-Match(우선) 혹은 If-Modified-Since와 일치하면 본문 없이 304 응답
+    compress_min_size 이상이면 Accept-Encoding에 맞춰 압축하고, 압축 결과는 워커 메모리에 재사용
+    modified_at: 응답 데이터가 마지막으로 바뀌었을 수 있는 시각 (모르면 생략)
+    """
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    encoding = None
+    if len(body) >= settings.compress_min_size:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    # 압축 방식마다 응답 바이트가 다르므로 ETag도 구분
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.http_max_age}, "
+            f"s-maxage={settings.http_shared_max_age}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if modified_at is not None:
+        headers["Last-Modified"] = formatdate(modified_at, usegmt=True)
+    if _not_modified(request, digest, modified_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is not None:
+        body = compress_cached(digest, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class GZipMiddleware(starlette_gzip.GZipMiddleware):
+    """
+    요청마다 gzip 압축 (starlette GZipMiddleware)
+    starlette는 Accept-Encoding에 gzip 글자만 있으면 압축하므로 q=0으로 거부한 요청은 제외
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            if _weight(_parse_accept_encoding(accept_encoding), "gzip") <= 0:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+class ServerTimingMiddleware:
+    """
+    요청마다 DB 쿼리 횟수/시간과 응답 헤더까지 걸린 시간을 Server-Timing 헤더로 응답
+    DB_DEBUG이면 같은 SQL을 여러 번 실행한 요청(N+1 의심)을 경고 로그로 기록
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        with track_queries(scope["path"]) as queries:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={queries.seconds * 1000:.1f};desc="queries={queries.count}", '
+                        f"app;dur={elapsed_ms:.1f}",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+            for statement, count in queries.repeated():
+                logger.warning(
+                    "possible N+1 query: %d times in %s %s",
+                    count,
+                    scope["path"],
+                    statement,
+                    extra={
+                        "path": scope["path"],
+                        "count": count,
+                        "statement": statement,
+                    },
+                )
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더(q 값 포함)에서 사용할 압축 방식 선택, 없으면 None"""
+    weights = _parse_accept_encoding(accept_encoding)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = _weight(weights, encoding)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_cached(digest: str, body: bytes, encoding: str) -> bytes:
+    """같은 본문은 한 번만 압축"""
+    compressed = compressed_cache.get(digest, encoding)
+    if compressed is not None:
+        compression_stats["reused"] += 1
+        return compressed
+    compression_stats["compressed"] += 1
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=settings.compress_level)
+    else:
+        compressed = gzip.compress(body, compresslevel=settings.compress_level)
+    compressed_cache.set(digest, compressed, encoding)
+    return compressed
+
+
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    return weights
+
+
+def _weight(weights: Dict[str, float], encoding: str) -> float:
+    return weights.get(encoding, weights.get("*", 0.0))
+
+
+def _not_modified(request: Request, digest: str, modified_at: Optional[float]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # 압축 방식과 상관없이 같은 본문이면 일치 ("해시-압축 방식" 형식)
+        tags = [
+            tag.strip().removeprefix("W/").strip('"').split("-")[0]
+            for tag in if_none_match.split(",")
+        ]
+        return "*" in tags or digest in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or modified_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP 날짜는 초 단위이므로 초 미만은 버리고 비교
+    return int(modified_at) <= since.timestamp()
@@ -0,0 +1,164 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    and_,
+    column,
+    event,
+    func,
+    inspect,
+    literal_column,
+    or_,
+    table,
+    text,
+)
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+
+from common import PAGE_SIZE, decode_cursor
+from database import Post
+
+# 검색 인덱스 이름 (SQLite: FTS5 가상 테이블, MySQL: FULLTEXT 인덱스)
+SEARCH_INDEX = "post_fts"
+
+# SQLite FTS5 bm25 가중치 (title, content 순서, 제목 일치를 더 높게 평가)
+TITLE_WEIGHT = 2.0
+CONTENT_WEIGHT = 1.0
+
+# SQLite: post 테이블을 원본으로 쓰는 FTS5 인덱스, 트리거로 post 변경과 같은 트랜잭션에서 동기화
+# prefix: 2, 3글자 접두사 인덱스 (한국어 조사가 붙은 단어도 접두사 검색으로 찾기 위함)
+_SQLITE_CREATE = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX} USING fts5(
+        title, content, content='post', content_rowid='post_id', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_INDEX}_insert AFTER INSERT ON post BEGIN
+        INSERT INTO {SEARCH_INDEX}(rowid, title, content)
+        VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_INDEX}_delete AFTER DELETE ON post BEGIN
+        INSERT INTO {SEARCH_INDEX}({SEARCH_INDEX}, rowid, title, content)
+        VALUES ('delete', old.post_id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_INDEX}_update
+    AFTER UPDATE OF title, content ON post BEGIN
+        INSERT INTO {SEARCH_INDEX}({SEARCH_INDEX}, rowid, title, content)
+        VALUES ('delete', old.post_id, old.title, old.content);
+        INSERT INTO {SEARCH_INDEX}(rowid, title, content)
+        VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+]
+
+# MySQL: InnoDB FULLTEXT 인덱스는 DB가 직접 동기화, 한국어는 단어 경계가 모호해서 ngram 파서 사용
+_MYSQL_CREATE = [
+    f"CREATE FULLTEXT INDEX {SEARCH_INDEX} ON post (title, content) WITH PARSER ngram"
+]
+
+
+def create_search_index(connection) -> None:
+    """
+    검색 인덱스 생성 (이미 있으면 건너뜀), 동기 연결에서 실행
+    post 테이블 생성 직후 자동으로 실행되고, 기존 DB는 rebuild_search_index로 생성
+    """
+    dialect_name = connection.dialect.name
+    if dialect_name == "sqlite":
+        for ddl in _SQLITE_CREATE:
+            connection.execute(text(ddl))
+    elif dialect_name == "mysql":
+        indexes = inspect(connection).get_indexes("post")
+        if all(index["name"] != SEARCH_INDEX for index in indexes):
+            for ddl in _MYSQL_CREATE:
+                connection.execute(text(ddl))
+
+
+def drop_search_index(connection) -> None:
+    """검색 인덱스 삭제 (MySQL 인덱스와 SQLite 트리거는 post 테이블과 함께 삭제됨)"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_INDEX}"))
+
+
+def rebuild_search_index(connection) -> None:
+    """검색 인덱스를 post 테이블 전체 내용으로 다시 생성"""
+    dialect_name = connection.dialect.name
+    if dialect_name == "sqlite":
+        create_search_index(connection)
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_INDEX}({SEARCH_INDEX}) VALUES ('rebuild')")
+        )
+    elif dialect_name == "mysql":
+        indexes = inspect(connection).get_indexes("post")
+        if any(index["name"] == SEARCH_INDEX for index in indexes):
+            connection.execute(text(f"ALTER TABLE post DROP INDEX {SEARCH_INDEX}"))
+        create_search_index(connection)
+
+
+# create_all/drop_all 시 post 테이블과 함께 검색 인덱스 생성/삭제
+event.listen(
+    Post.__table__,
+    "after_create",
+    lambda target, connection, **kw: create_search_index(connection),
+)
+event.listen(
+    Post.__table__,
+    "before_drop",
+    lambda target, connection, **kw: drop_search_index(connection),
+)
+
+
+def search_statement(dialect_name: str, q: str, cursor: Optional[str]):
+    """
+    검색어에 일치하는 게시글을 관련도 순으로 한 페이지 조회하는 쿼리
+    rank는 작을수록 관련도가 높고, (rank, post_id) 기준 커서로 다음 페이지 조회
+    """
+    terms = q.split()
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="검색어가 올바르지 않습니다.",
+        )
+    if dialect_name == "sqlite":
+        # 검색어를 단어별 접두사 검색으로 변환 (FTS5 문법 문자는 따옴표로 감싸서 무시)
+        query = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+        fts = table(SEARCH_INDEX, column("rowid"))
+        ranked = (
+            select(
+                Post,
+                func.bm25(
+                    literal_column(SEARCH_INDEX), TITLE_WEIGHT, CONTENT_WEIGHT
+                ).label("rank"),
+            )
+            .join(fts, fts.c.rowid == Post.post_id)
+            .where(literal_column(SEARCH_INDEX).op("MATCH")(query))
+        )
+    elif dialect_name == "mysql":
+        score = match(Post.title, Post.content, against=q).in_natural_language_mode()
+        ranked = select(Post, (-score).label("rank")).where(score)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="검색을 지원하지 않는 DB입니다.",
+        )
+    ranked = ranked.subquery()
+    post = aliased(Post, ranked)
+    statement = (
+        select(post, ranked.c.rank)
+        .order_by(ranked.c.rank, ranked.c.post_id)
+        .limit(PAGE_SIZE)
+    )
+    if cursor is None:
+        return statement
+    rank, post_id = decode_cursor(cursor, (float, int))
+    return statement.where(
+        or_(
+            ranked.c.rank > rank,
+            and_(ranked.c.rank == rank, ranked.c.post_id > post_id),
+        )
+    )
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fakeredis import aioredis as fakeredis
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+
+import cache
+from cache import INVALIDATE_CHANNEL, local_cache
+
+KEY = "post:1"
+
+
+class Value(BaseModel):
+    v: str
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    # 테스트마다 워커 메모리 캐시, 진행 중인 조회, 통계 초기화
+    local_cache.clear()
+    cache._inflight.clear()
+    monkeypatch.setattr(cache, "stats", dict.fromkeys(cache.stats, 0))
+    yield
+    local_cache.clear()
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    # 아무것도 실행되지 않는 포트로 연결 (연결 실패 = redis 장애)
+    monkeypatch.setattr(cache, "redis", aioredis.from_url("redis://127.0.0.1:1"))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = fakeredis.FakeRedis()
+    monkeypatch.setattr(cache, "redis", redis)
+    return redis
+
+
+def counting_loader(value: bytes, release: asyncio.Event = None):
+    """호출 횟수를 세고, release가 있으면 set될 때까지 기다렸다가 value 반환"""
+    calls = []
+
+    async def loader():
+        calls.append(value)
+        if release is not None:
+            await release.wait()
+        return value
+
+    return loader, calls
+
+
+def test_success_cache_single_flight(redis_down):
+    async def scenario():
+        # given
+        release = asyncio.Event()
+        loader, calls = counting_loader(b'{"v":1}', release)
+
+        # when
+        tasks = [
+            asyncio.create_task(cache.get_or_load_json(KEY, loader)) for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        # then
+        assert results == [b'{"v":1}'] * 5
+        assert len(calls) == 1
+        assert cache.stats["coalesced"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_invalidate_during_load(redis_down):
+    async def scenario():
+        # given
+        release = asyncio.Event()
+        old_loader, _ = counting_loader(b'{"v":"old"}', release)
+        new_loader, new_calls = counting_loader(b'{"v":"new"}')
+        task = asyncio.create_task(cache.get_or_load_json(KEY, old_loader))
+        await asyncio.sleep(0.01)
+
+        # when
+        await cache.invalidate(KEY)
+        release.set()
+        old = await task
+        new = await cache.get_or_load_json(KEY, new_loader)
+
+        # then
+        # 변경 전에 시작된 조회 결과는 기다리던 요청에만 응답하고 캐시에 저장하지 않음
+        assert old == b'{"v":"old"}'
+        assert new == b'{"v":"new"}'
+        assert len(new_calls) == 1
+        assert cache._unpack(local_cache.get(KEY))[1] == b'{"v":"new"}'
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_invalidate_during_batch_load(redis_down):
+    async def scenario():
+        # given
+        release = asyncio.Event()
+
+        async def old_loader(keys):
+            await release.wait()
+            return {key: Value(v="old") for key in keys}
+
+        fresh_loader, fresh_calls = counting_loader(b'{"v":"new"}')
+        task = asyncio.create_task(cache.get_or_load_many([KEY], Value, old_loader))
+        await asyncio.sleep(0.01)
+
+        # when
+        await cache.invalidate(KEY)
+        release.set()
+        old = await task
+        new = await cache.get_or_load_json(KEY, fresh_loader)
+
+        # then
+        # 변경 전에 시작된 묶음 조회 결과는 응답에만 쓰고 캐시에 저장하지 않음
+        assert old == {KEY: Value(v="old")}
+        assert new == b'{"v":"new"}'
+        assert len(fresh_calls) == 1
+        assert not cache._batch_loads
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_stale_while_revalidate(redis_down):
+    async def scenario():
+        # given
+        stale_entry = f"{time.time() - 1:.3f}|".encode() + b'{"v":"old"}'
+        local_cache.set(KEY, stale_entry)
+        loader, calls = counting_loader(b'{"v":"new"}')
+
+        # when
+        stale = await cache.get_or_load_json(KEY, loader)
+        while cache._inflight:
+            await asyncio.sleep(0.01)
+        fresh = await cache.get_or_load_json(KEY, loader)
+
+        # then
+        assert stale == b'{"v":"old"}'
+        assert fresh == b'{"v":"new"}'
+        assert len(calls) == 1
+        assert cache.stats["stale"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_redis_down(redis_down):
+    async def scenario():
+        # given
+        loader, calls = counting_loader(b'{"v":1}')
+
+        # when
+        first = await cache.get_or_load_json(KEY, loader)
+        second = await cache.get_or_load_json(KEY, loader)
+        await cache.invalidate(KEY)
+        third = await cache.get_or_load_json(KEY, loader)
+
+        # then
+        # redis 없이도 DB 조회 + 워커 메모리 캐시로 응답
+        assert first == second == third == b'{"v":1}'
+        assert len(calls) == 2
+        assert cache.stats["local_hit"] == 1
+        assert cache.stats["error"] > 0
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_previous_format_is_miss(fake_redis):
+    async def scenario():
+        # given
+        # fresh_until 없이 저장된 이전 형식 값
+        await fake_redis.set(KEY, b'{"v":"old|format"}')
+        loader, calls = counting_loader(b'{"v":"new"}')
+
+        # when
+        result = await cache.get_or_load_json(KEY, loader)
+
+        # then
+        assert result == b'{"v":"new"}'
+        assert len(calls) == 1
+        assert cache._unpack(await fake_redis.get(KEY)) is not None
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_peer_released_without_value(fake_redis, monkeypatch):
+    async def scenario():
+        # given
+        # 다른 워커가 락을 잡고 조회했지만 없는 데이터라 캐시를 채우지 않고 락을 푼 경우
+        monkeypatch.setattr(cache.settings, "cache_lock_timeout_ms", 3000)
+        await fake_redis.set(f"lock:{KEY}:", b"peer", px=3000)
+        loader, calls = counting_loader(None)
+
+        # when
+        started = time.monotonic()
+        task = asyncio.create_task(cache.get_or_load_json(KEY, loader))
+        await asyncio.sleep(0.1)
+        await fake_redis.delete(f"lock:{KEY}:")
+        result = await task
+
+        # then
+        # 락 만료 시간(3초)까지 기다리지 않고 바로 직접 조회
+        assert result is None
+        assert len(calls) == 1
+        assert time.monotonic() - started < 1
+
+    asyncio.run(scenario())
+
+
+def test_success_cache_pubsub_invalidation(fake_redis):
+    async def scenario():
+        # given
+        local_cache.set(KEY, b"0|{}")
+        await cache.start_invalidation_listener()
+        await asyncio.sleep(0.05)
+
+        # when
+        # 다른 워커가 발행한 무효화 메시지
+        await fake_redis.publish(INVALIDATE_CHANNEL, json.dumps([KEY]))
+        for _ in range(50):
+            if local_cache.get(KEY) is None:
+                break
+            await asyncio.sleep(0.01)
+        await cache.stop_invalidation_listener()
+
+        # then
+        assert local_cache.get(KEY) is None
+
+    asyncio.run(scenario())
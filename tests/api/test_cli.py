@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, create_engine
+from typer.testing import CliRunner
+
+from api.api_schema import UserRole
+from cli import app
+from common import password_hashing
+from counter import user_post_counter
+from database import Counter, Post, User, sqlite_url
+
+# 테스트 데이터 준비/확인은 동기 엔진으로 명령과 같은 DB 파일에 접근
+engine = create_engine(sqlite_url.replace("+aiosqlite", ""))
+
+runner = CliRunner()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_environment():
+    # setup
+    SQLModel.metadata.create_all(engine)
+
+    yield
+
+    # teardown
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    with Session(engine) as session:
+        yield session
+        session.rollback()
+
+
+def test_success_create_indexes_twice():
+    # given : 배포 전 DB처럼 인덱스 하나가 없는 상태
+    index = next(
+        index
+        for index in Post.__table__.indexes
+        if index.name == "ix_post_author_created_at"
+    )
+    index.drop(engine)
+
+    # when : 같은 명령을 두 번 실행
+    first = runner.invoke(app, ["create-indexes"])
+    second = runner.invoke(app, ["create-indexes"])
+
+    # then : 처음에만 없는 인덱스를 만들고, 다시 실행해도 오류 없음
+    assert first.exit_code == 0
+    assert second.exit_code == 0
+    assert "CREATE INDEX ix_post_author_created_at" in first.output
+    assert "CREATE INDEX" not in second.output
+    indexes = {index["name"] for index in inspect(engine).get_indexes("post")}
+    assert "ix_post_author_created_at" in indexes
+
+
+def test_success_reconcile_counters(db_session):
+    session = db_session
+
+    # given : 게시글 2개를 작성했지만 카운터는 잘못된 값
+    session.add(
+        User(
+            user_id="member0301",
+            password=password_hashing.hash("A1234567890"),
+            nickname="member",
+            role=UserRole.member,
+        )
+    )
+    session.commit()
+    posts = [
+        Post(author="member0301", title="카운터 제목 1", content="내용"),
+        Post(author="member0301", title="카운터 제목 2", content="내용"),
+    ]
+    session.add_all(posts)
+    session.merge(Counter(name=user_post_counter("member0301"), value=99))
+    session.commit()
+
+    # when
+    result = runner.invoke(app, ["reconcile-counters"])
+
+    # then : 실제 게시글 개수로 수정
+    assert result.exit_code == 0
+    assert f"{user_post_counter('member0301')}: 99 -> 2" in result.output
+    session.expire_all()
+    assert session.get(Counter, user_post_counter("member0301")).value == 2
+
+    # 다른 테스트 파일의 게시글 번호가 밀리지 않도록 만든 데이터 삭제
+    for row in [*posts, session.get(Counter, user_post_counter("member0301"))]:
+        session.delete(row)
+    session.delete(session.get(User, "member0301"))
+    session.commit()
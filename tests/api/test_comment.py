@@ -1,15 +1,19 @@
+import asyncio
 from datetime import timedelta
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, select
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from api.api_schema import CommentBody, CommentConent, UserRole
 from api.user import add_token_to_db
 from common import encode_access_token, password_hashing, settings
-from database import Comment, Post, User, engine
+from database import Comment, Post, User, sqlite_url
 from main import app
 
+# 테스트 데이터 준비/확인은 동기 엔진으로 앱과 같은 DB 파일에 접근
+engine = create_engine(sqlite_url.replace("+aiosqlite", ""))
+
 client = TestClient(app)
 
 
@@ -48,7 +52,7 @@ def test_success_create_comment(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin011"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     post = Post(author="admin011", title="게시물 제목", content="게시물 내용")
@@ -94,7 +98,7 @@ def test_success_edit_comment(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin022"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     post = Post(author="admin022", title="게시물 제목", content="게시물 내용")
@@ -133,7 +137,7 @@ def test_success_delete_comment(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin033"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     post = Post(author="admin033", title="게시물 제목", content="게시물 내용")
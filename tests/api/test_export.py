@@ -0,0 +1,101 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from api.api_schema import UserRole
+from api.user import add_token_to_db
+from common import encode_access_token, password_hashing, settings
+from database import Post, User, sqlite_url
+from main import app
+
+# 테스트 데이터 준비/확인은 동기 엔진으로 앱과 같은 DB 파일에 접근
+engine = create_engine(sqlite_url.replace("+aiosqlite", ""))
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_environment():
+    # setup
+    SQLModel.metadata.create_all(engine)
+
+    yield
+
+    # teardown
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    with Session(engine) as session:
+        yield session
+        session.rollback()
+
+
+def test_success_export_posts_csv(db_session):
+    session = db_session
+
+    # given
+    hashed_password = password_hashing.hash("A1234567890")
+    user = User(
+        user_id="admin0101",
+        password=hashed_password,
+        nickname="admin",
+        role=UserRole.admin,
+    )
+    session.add(user)
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "admin0101"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+    post = Post(author="admin0101", title="내보내기 제목", content="내보내기 내용")
+    session.add(post)
+    session.commit()
+
+    # when
+    response = client.get(
+        "/api/export/posts?format=csv&author=admin0101", headers=headers
+    )
+    lines = response.text.splitlines()
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert lines[0] == "post_id,author,title,content,created_at"
+    assert len(lines) == 2
+    assert "내보내기 제목" in lines[1]
+
+
+def test_fail403_export_comments_member(db_session):
+    session = db_session
+
+    # given
+    hashed_password = password_hashing.hash("A1234567890")
+    user = User(
+        user_id="member0102",
+        password=hashed_password,
+        nickname="member",
+        role=UserRole.member,
+    )
+    session.add(user)
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "member0102"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+
+    # when
+    response = client.get("/api/export/comments", headers=headers)
+    res_data = response.json()
+
+    # then
+    assert response.status_code == 403
+    assert res_data["detail"] == "관리자만 내보내기를 사용할 수 있습니다."
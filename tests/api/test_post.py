@@ -1,15 +1,28 @@
-from datetime import timedelta
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, select
+from sqlmodel import Session, SQLModel, create_engine, select
 
+import autocomplete
+import database
 from api.api_schema import RequestBody, UserRole
 from api.user import add_token_to_db
-from common import encode_access_token, password_hashing, settings
-from database import Comment, Post, User, engine
+from common import (
+    PAGE_SIZE,
+    encode_access_token,
+    encode_cursor,
+    password_hashing,
+    settings,
+)
+from database import Comment, Post, User, sqlite_url
 from main import app
 
+# 테스트 데이터 준비/확인은 동기 엔진으로 앱과 같은 DB 파일에 접근
+engine = create_engine(sqlite_url.replace("+aiosqlite", ""))
+
 client = TestClient(app)
 
 
@@ -48,7 +61,7 @@ def test_success_create_post(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin0001"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     # when
@@ -100,7 +113,7 @@ def test_success_get_post(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin0023"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin0023", title="게시물 제목", content="게시물 내용")
     session.add(post)
@@ -132,7 +145,7 @@ def test_success_edit_post(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin0044"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin0044", title="게시물 제목", content="게시물 내용")
     session.add(post)
@@ -169,7 +182,7 @@ def test_success_delete_post(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin0055"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin0055", title="게시물 제목", content="게시물 내용")
     session.add(post)
@@ -201,7 +214,7 @@ def test_success_get_post_comments(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin0066"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin0066", title="게시물 제목", content="게시물 내용")
     session.add(post)
@@ -217,3 +230,518 @@ def test_success_get_post_comments(db_session):
     # then
     assert response.status_code == 200
     assert res_data["message"] == "게시글 별로 작성된 댓글 목록 조회 성공"
+
+
+def test_fail400_get_post_list_cursor():
+    # when : 잘못된 커서 값으로 목록 조회
+    response = client.get("/api/posts/?cursor=invalid")
+    res_data = response.json()
+
+    # then
+    assert response.status_code == 400
+    assert res_data["detail"] == "커서 값이 올바르지 않습니다."
+
+
+def test_success_get_post_comments_cursor(db_session):
+    session = db_session
+
+    # given : 페이지 경계에 걸쳐 created_at이 같은 댓글이 몰려 있는 게시글
+    session.add(
+        User(
+            user_id="member0090",
+            password=password_hashing.hash("A1234567890"),
+            nickname="member",
+            role=UserRole.member,
+        )
+    )
+    post = Post(author="member0090", title="커서 확인", content="내용")
+    session.add(post)
+    session.commit()
+    start = datetime(2024, 3, 6, tzinfo=timezone.utc)
+    comments = [
+        Comment(
+            author_id="member0090",
+            post_id=post.post_id,
+            content=f"댓글 {i}",
+            # 45개씩 같은 시각 (한 페이지 100개 안팎에서 같은 시각이 이어짐)
+            created_at=start + timedelta(seconds=i // 45),
+        )
+        for i in range(PAGE_SIZE * 2 + 5)
+    ]
+    session.add_all(comments)
+    session.commit()
+    expected = [comment.com_id for comment in comments]
+
+    # when : next_cursor를 따라 마지막 페이지까지 조회
+    com_ids = []
+    url = f"/api/posts/{post.post_id}/comments/"
+    response = client.get(url, params={"page": 1})
+    while True:
+        assert response.status_code == 200
+        res_data = response.json()
+        com_ids.extend(data["com_id"] for data in res_data["data"])
+        if res_data["next_cursor"] is None:
+            break
+        response = client.get(url, params={"cursor": res_data["next_cursor"]})
+
+    # then : 중복/누락 없이 (created_at, com_id) 순서로 모두 조회
+    assert com_ids == expected
+
+
+def test_fail401_create_post_invalid_token():
+    # when : 잘못된 토큰으로 게시글 생성
+    post_request_body = RequestBody(
+        author="admin0001", title="게시물 제목", content="게시물 내용"
+    )
+    response = client.post(
+        "/api/posts/",
+        json=post_request_body.dict(),
+        headers={"Authorization": "invalid"},
+    )
+    res_data = response.json()
+
+    # then
+    assert response.status_code == 401
+    assert res_data["detail"] == "유효하지 않은 토큰입니다."
+
+
+def test_success_create_posts_bulk(db_session):
+    session = db_session
+
+    # given
+    hashed_password = password_hashing.hash("A1234567890")
+    user = User(
+        user_id="member0088",
+        password=hashed_password,
+        nickname="member",
+        role=UserRole.member,
+    )
+    session.add(user)
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "member0088"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+
+    # when : 본인 게시글 2개, 다른 작성자 1개, 필수 항목 누락 1개
+    bulk_body = [
+        {"author": "member0088", "title": "대량 제목 1", "content": "내용"},
+        {"author": "member0088", "title": "대량 제목 2", "content": "내용"},
+        {"author": "admin0001", "title": "대량 제목 3", "content": "내용"},
+        {"author": "member0088", "title": "대량 제목 4"},
+    ]
+    response = client.post("/api/posts/bulk", json=bulk_body, headers=headers)
+    res_data = response.json()
+
+    # then
+    assert response.status_code == 201
+    assert res_data["created"] == 2
+    assert [error["index"] for error in res_data["errors"]] == [2, 3]
+    db_posts = session.exec(select(Post).where(Post.author == "member0088")).all()
+    assert len(db_posts) == 2
+
+
+def test_success_create_posts_bulk_unknown_author(db_session):
+    session = db_session
+
+    # given
+    session.add(
+        User(
+            user_id="admin0099",
+            password=password_hashing.hash("A1234567890"),
+            nickname="admin",
+            role=UserRole.admin,
+        )
+    )
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "admin0099"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+
+    # when : 관리자가 없는 작성자로 생성
+    bulk_body = [
+        {"author": "admin0099", "title": "관리자 대량 제목", "content": "내용"},
+        {"author": "nobody0099", "title": "없는 작성자", "content": "내용"},
+    ]
+    response = client.post("/api/posts/bulk", json=bulk_body, headers=headers)
+    res_data = response.json()
+
+    # then : 외래 키 오류로 전체 실패하지 않고 해당 항목만 오류
+    assert response.status_code == 201
+    assert res_data["created"] == 1
+    assert res_data["errors"] == [
+        {"index": 1, "detail": "유저 아이디가 존재하지 않습니다."}
+    ]
+
+
+def test_success_create_posts_bulk_ndjson(db_session):
+    session = db_session
+
+    # given
+    session.add(
+        User(
+            user_id="member0087",
+            password=password_hashing.hash("A1234567890"),
+            nickname="member",
+            role=UserRole.member,
+        )
+    )
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "member0087"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {
+        "Authorization": f"{access_token}",
+        "Content-Type": "application/x-ndjson",
+    }
+
+    # when : 빈 줄이 섞인 NDJSON, 3번째 줄과 5번째 줄이 잘못된 항목
+    lines = [
+        '{"author": "member0087", "title": "줄 제목 1", "content": "내용"}',
+        "",
+        "{",
+        '{"author": "member0087", "title": "줄 제목 2", "content": "내용"}',
+        '{"author": "member0087", "title": "줄 제목 3"}',
+    ]
+    response = client.post(
+        "/api/posts/bulk", content="\n".join(lines).encode(), headers=headers
+    )
+    res_data = response.json()
+
+    # then : 오류 순번은 빈 줄을 포함한 줄 번호
+    assert response.status_code == 201
+    assert res_data["created"] == 2
+    assert [error["index"] for error in res_data["errors"]] == [2, 4]
+
+
+def test_fail413_create_posts_bulk(db_session, monkeypatch):
+    session = db_session
+
+    # given
+    session.add(
+        User(
+            user_id="member0086",
+            password=password_hashing.hash("A1234567890"),
+            nickname="member",
+            role=UserRole.member,
+        )
+    )
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "member0086"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+    monkeypatch.setattr(settings, "bulk_max_items", 1)
+    monkeypatch.setattr(settings, "bulk_max_bytes", 200)
+    item = {"author": "member0086", "title": "제한 제목", "content": "내용"}
+
+    # when : 항목 개수 초과(NDJSON), 본문 크기 초과(JSON 배열)
+    too_many = client.post(
+        "/api/posts/bulk",
+        content=b"\n".join([json.dumps(item).encode()] * 2),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    too_large = client.post("/api/posts/bulk", json=[item] * 10, headers=headers)
+
+    # then
+    assert too_many.status_code == 413
+    assert too_many.json()["detail"] == "한 번에 최대 1개까지 생성할 수 있습니다."
+    assert too_large.status_code == 413
+    assert (
+        too_large.json()["detail"] == "요청 본문은 최대 200바이트까지 보낼 수 있습니다."
+    )
+    db_posts = session.exec(select(Post).where(Post.author == "member0086")).all()
+    assert db_posts == []
+
+
+def test_success_get_posts_batch(db_session):
+    session = db_session
+
+    # given
+    posts = [
+        Post(author="admin0001", title=f"묶음 조회 {i}", content="내용")
+        for i in range(3)
+    ]
+    session.add_all(posts)
+    session.commit()
+    post_ids = [post.post_id for post in posts]
+
+    # when : 요청 순서를 섞고 없는 게시글 번호 포함
+    ids = [post_ids[2], 999999, post_ids[0], post_ids[1]]
+    response = client.get(f"/api/posts/batch?ids={','.join(map(str, ids))}")
+    res_data = response.json()
+    post_response = client.post("/api/posts/batch", json={"ids": ids})
+
+    # then
+    assert response.status_code == 200
+    assert [data["post_id"] if data else None for data in res_data["data"]] == [
+        post_ids[2],
+        None,
+        post_ids[0],
+        post_ids[1],
+    ]
+    assert res_data["missing"] == [999999]
+    assert post_response.status_code == 200
+    assert post_response.json()["data"] == res_data["data"]
+
+
+def test_success_get_post_include_comments(db_session):
+    session = db_session
+
+    # given
+    post = Post(author="admin0001", title="댓글 포함 조회", content="내용")
+    session.add(post)
+    session.commit()
+    for i in range(2):
+        client.post(
+            "/api/comments/",
+            json={
+                "author_id": "admin0001",
+                "post_id": post.post_id,
+                "content": f"댓글 {i}",
+            },
+        )
+
+    # when
+    response = client.get(f"/api/posts/{post.post_id}?include=comments,comment_count")
+    res_data = response.json()
+    plain_response = client.get(f"/api/posts/{post.post_id}")
+
+    # then
+    assert response.status_code == 200
+    assert res_data["data"]["comment_count"] == 2
+    assert [com["content"] for com in res_data["data"]["comments"]] == [
+        "댓글 0",
+        "댓글 1",
+    ]
+    assert "comments" not in plain_response.json()["data"]
+
+
+def test_success_get_user_posts_total(db_session):
+    session = db_session
+
+    # given : 게시글 2개를 작성한 유저 (카운터가 갱신되도록 API로 생성)
+    user = User(
+        user_id="member0089",
+        password=password_hashing.hash("A1234567890"),
+        nickname="member",
+        role=UserRole.member,
+    )
+    session.add(user)
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "member0089"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+    bulk_body = [
+        {"author": "member0089", "title": f"개수 확인 {i}", "content": "내용"}
+        for i in range(2)
+    ]
+    assert (
+        client.post("/api/posts/bulk", json=bulk_body, headers=headers).status_code
+        == 201
+    )
+
+    # when
+    response = client.get("/api/users/member0089/posts/", headers=headers)
+    res_data = response.json()
+
+    # then : 카운터 테이블 값으로 전체 개수 응답
+    assert response.status_code == 200
+    assert res_data["total"] == 2
+
+
+def test_success_search_posts(db_session):
+    session = db_session
+
+    # given
+    session.add_all(
+        [
+            Post(author="admin0001", title="검색어 제목", content="본문"),
+            Post(author="admin0001", title="다른 제목", content="본문에 검색어"),
+            Post(author="admin0001", title="관계없는 글", content="본문"),
+        ]
+    )
+    session.commit()
+
+    # when
+    response = client.get("/api/posts/search?q=검색어")
+    res_data = response.json()
+
+    # then : 제목에 일치한 게시글이 먼저 조회
+    assert response.status_code == 200
+    assert [data["title"] for data in res_data["data"]] == ["검색어 제목", "다른 제목"]
+    assert res_data["next_cursor"] == None
+
+
+def test_fail400_search_posts_cursor():
+    # given : 목록 조회용 (created_at, 기본키) 커서
+    cursor = encode_cursor((datetime(2024, 1, 1), 1))
+
+    # when : 검색 커서 자리에 형식이 다른 커서 사용
+    response = client.get(f"/api/posts/search?q=검색어&cursor={cursor}")
+    res_data = response.json()
+
+    # then
+    assert response.status_code == 400
+    assert res_data["detail"] == "커서 값이 올바르지 않습니다."
+
+
+def test_success_autocomplete_titles(db_session):
+    session = db_session
+
+    # given : 서버 시작 시와 같이 post 테이블로 제목 색인 생성
+    session.add(Post(author="admin0001", title="자동완성 첫 글", content="내용"))
+    session.commit()
+    asyncio.run(autocomplete.build_title_index())
+    post_request_body = RequestBody(
+        author="admin0001", title="자동완성 두번째 글", content="내용"
+    )
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "admin0001"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    client.post(
+        "/api/posts/",
+        json=post_request_body.dict(),
+        headers={"Authorization": f"{access_token}"},
+    )
+
+    # when
+    response = client.get("/api/posts/autocomplete?q=자동완성")
+    res_data = response.json()
+
+    # then : 시작 이후 생성한 게시글 제목도 반영
+    assert response.status_code == 200
+    assert res_data["data"] == ["자동완성 두번째 글", "자동완성 첫 글"]
+
+
+def test_success_get_post_not_modified(db_session):
+    session = db_session
+
+    # given
+    post = Post(author="admin0001", title="조건부 조회", content="내용")
+    session.add(post)
+    session.commit()
+    response = client.get(f"/api/posts/{post.post_id}")
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    # when : 이전 응답의 ETag, Last-Modified로 다시 조회
+    etag_response = client.get(
+        f"/api/posts/{post.post_id}", headers={"If-None-Match": etag}
+    )
+    date_response = client.get(
+        f"/api/posts/{post.post_id}", headers={"If-Modified-Since": last_modified}
+    )
+
+    # then : 본문 없이 304 응답
+    assert response.status_code == 200
+    assert "max-age" in response.headers["Cache-Control"]
+    assert etag_response.status_code == 304
+    assert etag_response.content == b""
+    assert etag_response.headers["ETag"] == etag
+    assert date_response.status_code == 304
+
+
+def test_success_get_post_compressed(db_session):
+    session = db_session
+
+    # given : 압축 기준 크기보다 큰 게시글
+    post = Post(author="admin0001", title="압축 조회", content="내용 " * 1000)
+    session.add(post)
+    session.commit()
+
+    # when
+    response = client.get(
+        f"/api/posts/{post.post_id}", headers={"Accept-Encoding": "gzip"}
+    )
+    plain_response = client.get(
+        f"/api/posts/{post.post_id}", headers={"Accept-Encoding": "identity"}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.num_bytes_downloaded < len(response.content)
+    assert response.json()["data"]["content"] == post.content
+    assert "Content-Encoding" not in plain_response.headers
+    assert plain_response.json() == response.json()
+
+
+def test_success_get_posts_fields(db_session):
+    session = db_session
+
+    # given
+    post = Post(author="admin0001", title="필드 선택 조회", content="내용")
+    session.add(post)
+    session.commit()
+
+    # when
+    response = client.get("/api/posts/?fields=title,author")
+    include_response = client.get(
+        f"/api/posts/{post.post_id}?fields=title&include=comment_count"
+    )
+    invalid_response = client.get("/api/posts/?fields=password")
+
+    # then : 요청한 필드만 응답
+    assert response.status_code == 200
+    assert all(set(data) == {"author", "title"} for data in response.json()["data"])
+    assert include_response.json()["data"] == {
+        "title": "필드 선택 조회",
+        "comment_count": 0,
+    }
+    assert invalid_response.status_code == 400
+
+
+def test_success_get_metrics(db_session):
+    pytest.importorskip("prometheus_client")
+    session = db_session
+
+    # given
+    post = Post(author="admin0001", title="지표 조회", content="내용")
+    session.add(post)
+    session.commit()
+    client.get(f"/api/posts/{post.post_id}")
+
+    # when
+    response = client.get("/metrics")
+
+    # then : 게시글 번호 대신 라우트 경로로 집계
+    assert response.status_code == 200
+    assert 'route="/api/posts/{post_id}"' in response.text
+    assert f'route="/api/posts/{post.post_id}"' not in response.text
+    assert "db_queries_per_request_bucket" in response.text
+    assert 'cache_events_total{result="miss"}' in response.text
+
+
+def test_success_server_timing(db_session, monkeypatch, caplog):
+    session = db_session
+
+    # given : 디버그 모드, 같은 SQL 1번 실행부터 N+1 의심으로 기록
+    monkeypatch.setattr(database, "DEBUG", True)
+    monkeypatch.setattr(database, "N_PLUS_ONE_THRESHOLD", 1)
+    post = Post(author="admin0001", title="쿼리 시간", content="내용")
+    session.add(post)
+    session.commit()
+
+    # when
+    with caplog.at_level("WARNING", logger="responses"):
+        response = client.get(f"/api/posts/{post.post_id}?fields=title")
+
+    # then : 캐시 미스로 DB 조회한 쿼리 수/시간을 헤더로 응답
+    assert response.status_code == 200
+    assert 'desc="queries=1"' in response.headers["Server-Timing"]
+    assert "possible N+1 query" in caplog.text
@@ -1,15 +1,20 @@
+import asyncio
+import time
 from datetime import timedelta
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, select
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from api.api_schema import Login, UserBody, UserRole, UserSign
 from api.user import add_token_to_db, is_token_in_db
 from common import encode_access_token, password_hashing, settings, verify_password
-from database import Comment, Post, User, engine
+from database import Comment, Post, User, sqlite_url
 from main import app
 
+# 테스트 데이터 준비/확인은 동기 엔진으로 앱과 같은 DB 파일에 접근
+engine = create_engine(sqlite_url.replace("+aiosqlite", ""))
+
 client = TestClient(app)
 
 
@@ -88,7 +93,7 @@ def test_success_sign_in_user(db_session):
 
     # then
     assert response.status_code == 200
-    assert is_token_in_db(res_data["access_token"]) == True
+    assert asyncio.run(is_token_in_db(res_data["access_token"])) == True
 
     # 데이터베이스에서 유저 조회
     db_user = session.exec(
@@ -103,7 +108,7 @@ def test_success_logout_user():
     access_token = encode_access_token(
         data={"user_id": "admin001"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     # when : 로그아웃 성공
@@ -115,6 +120,42 @@ def test_success_logout_user():
     assert res_data["message"] == "로그아웃 성공"
 
 
+def test_fail401_token_after_logout(db_session):
+    session = db_session
+
+    # given
+    hashed_password = password_hashing.hash("A1234567890")
+    user = User(
+        user_id="admin06",
+        password=hashed_password,
+        nickname="admin",
+        role=UserRole.admin,
+    )
+    session.add(user)
+    session.commit()
+    access_token_expires = timedelta(days=settings.access_token_expire_days)
+    access_token = encode_access_token(
+        data={"user_id": "admin06"}, expires_delta=access_token_expires
+    )
+    asyncio.run(add_token_to_db(access_token))
+    headers = {"Authorization": f"{access_token}"}
+    user_edit_data = UserBody(nickname="editadmin", password="1234567890A")
+    before = client.put(
+        "/api/users/admin06", json=user_edit_data.dict(), headers=headers
+    )
+
+    # when : 로그아웃한 토큰으로 다시 요청
+    client.post("/api/users/logout", headers=headers)
+    response = client.put(
+        "/api/users/admin06", json=user_edit_data.dict(), headers=headers
+    )
+
+    # then
+    assert before.status_code == 200
+    assert response.status_code == 401
+    assert response.json()["detail"] == "유효하지 않은 토큰입니다."
+
+
 def test_success_create_user(db_session):
     session = db_session
 
@@ -157,7 +198,7 @@ def test_success_edit_user(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin02"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     # when
@@ -192,7 +233,7 @@ def test_success_delete_user(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin03"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
 
     # when
@@ -221,7 +262,7 @@ def test_success_get_user_posts(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin04"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin04", title="테스트 제목", content="테스트 내용")
     session.add(post)
@@ -253,7 +294,7 @@ def test_success_get_user_comments(db_session):
     access_token = encode_access_token(
         data={"user_id": "admin05"}, expires_delta=access_token_expires
     )
-    add_token_to_db(access_token)
+    asyncio.run(add_token_to_db(access_token))
     headers = {"Authorization": f"{access_token}"}
     post = Post(author="admin05", title="테스트 제목", content="테스트 내용")
     session.add(post)
@@ -269,3 +310,52 @@ def test_success_get_user_comments(db_session):
     # then
     assert response.status_code == 200
     assert res_data["message"] == "유저별 작성 댓글 조회 성공"
+
+
+def test_success_token_store_redis_down():
+    # given : 연결할 수 없는 redis
+    from redis import asyncio as aioredis
+
+    from token_store import MemoryTokenStore, RedisTokenStore
+
+    store = RedisTokenStore(
+        aioredis.from_url("redis://127.0.0.1:1"),
+        fallback=MemoryTokenStore(capacity=100, error_rate=0.01),
+    )
+    expires_at = time.time() + 60
+
+    async def scenario():
+        # when : 로그인, 인증, 로그아웃
+        await store.add("token", expires_at)
+        logged_in = await store.contains("token")
+        await store.remove("token")
+        return logged_in, await store.contains("token")
+
+    logged_in, logged_out = asyncio.run(scenario())
+
+    # then : 500 대신 워커 메모리 저장소로 처리
+    assert logged_in is True
+    assert logged_out is False
+
+
+def test_success_token_store_purge_amortized(monkeypatch):
+    # given : 만료되지 않은 토큰으로 가득 찬 메모리 저장소
+    from token_store import MemoryTokenStore
+
+    store = MemoryTokenStore(capacity=10, error_rate=0.01)
+    purges = []
+    purge = store._purge_expired
+    monkeypatch.setattr(store, "_purge_expired", lambda: purges.append(purge()))
+    expires_at = time.time() + 60
+
+    # when
+    async def scenario():
+        for i in range(100):
+            await store.add(f"token{i}", expires_at)
+        return await store.contains("token0"), await store.contains("token99")
+
+    first, last = asyncio.run(scenario())
+
+    # then : 토큰 수가 두 배가 될 때마다 한 번만 정리 (10, 20, 40, 80)
+    assert len(purges) == 4
+    assert first is True and last is True
@@ -9,6 +9,8 @@ load_dotenv()
 def pytest_configure():
     os.environ["TEST_ENV"] = "true"
     os.environ["DATABASE_URL"] = "sqlite:///tests.db"
+    # redis 없이 테스트할 수 있도록 로그인 토큰은 메모리 저장소 사용
+    os.environ["TOKEN_STORE"] = "memory"
 
 
 @pytest.fixture(scope="session", autouse=True)
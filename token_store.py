@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from cache import redis, stats
+from common import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(token: str) -> bytes:
+    """토큰 원문 대신 고정 길이 해시로 저장"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class BloomFilter:
+    """
+    음성 조회(없는 토큰 확인)를 빠르게 처리하기 위한 블룸 필터
+    False면 확실히 없음, True면 있을 수도 있음
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        # sha256 결과를 두 개의 해시로 나눠 double hashing으로 k개 위치 생성
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+
+class TokenStore(ABC):
+    """로그인 토큰 저장소 인터페이스"""
+
+    @abstractmethod
+    async def add(self, token: str, expires_at: float) -> None: ...
+
+    @abstractmethod
+    async def remove(self, token: str) -> None: ...
+
+    @abstractmethod
+    async def contains(self, token: str) -> bool: ...
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    redis 없이 사용하는 워커 메모리 저장소 (로컬/테스트 환경용)
+    블룸 필터로 없는 토큰은 dict 조회 없이 바로 판별
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._tokens: Dict[bytes, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        # 토큰 개수가 이 값에 도달하면 만료 토큰 정리
+        self._purge_at = capacity
+
+    async def add(self, token: str, expires_at: float) -> None:
+        if len(self._tokens) >= self._purge_at:
+            self._purge_expired()
+        digest = _digest(token)
+        self._tokens[digest] = expires_at
+        self._bloom.add(digest)
+
+    async def remove(self, token: str) -> None:
+        # 블룸 필터에서는 지울 수 없으므로 dict에서만 제거
+        self._tokens.pop(_digest(token), None)
+
+    async def contains(self, token: str) -> bool:
+        digest = _digest(token)
+        if digest not in self._bloom:
+            return False
+        expires_at = self._tokens.get(digest)
+        return expires_at is not None and expires_at > time.time()
+
+    def _purge_expired(self) -> None:
+        """
+        만료된 토큰을 지우고 남은 토큰으로 블룸 필터 재구성
+        다음 정리는 남은 토큰 수의 2배에 도달할 때 (정리 비용 O(n)을 그 사이 추가 n번에 분산)
+        """
+        now = time.time()
+        self._tokens = {
+            digest: expires_at
+            for digest, expires_at in self._tokens.items()
+            if expires_at > now
+        }
+        self._purge_at = max(self.capacity, len(self._tokens) * 2)
+        self._bloom = BloomFilter(self._purge_at, self.error_rate)
+        for digest in self._tokens:
+            self._bloom.add(digest)
+
+
+class RedisTokenStore(TokenStore):
+    """
+    토큰 만료 시각에 redis 키도 함께 만료되는 저장소 (워커 간 공유)
+    redis 장애 시에는 워커 메모리 저장소로 대신 처리 (장애 중 발급/로그아웃한 토큰은 워커 간 공유되지 않음)
+    """
+
+    def __init__(self, client: Redis, fallback: MemoryTokenStore):
+        self.client = client
+        self.fallback = fallback
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return f"auth_token:{_digest(token).hex()}"
+
+    async def add(self, token: str, expires_at: float) -> None:
+        try:
+            await self.client.set(self._key(token), 1, exat=int(expires_at))
+        except RedisError as e:
+            stats["error"] += 1
+            logger.warning("token store add failed: %s", e)
+            await self.fallback.add(token, expires_at)
+
+    async def remove(self, token: str) -> None:
+        await self.fallback.remove(token)
+        try:
+            await self.client.delete(self._key(token))
+        except RedisError as e:
+            stats["error"] += 1
+            logger.warning("token store remove failed: %s", e)
+
+    async def contains(self, token: str) -> bool:
+        try:
+            if await self.client.exists(self._key(token)) > 0:
+                return True
+        except RedisError as e:
+            stats["error"] += 1
+            logger.warning("token store read failed: %s", e)
+        # 장애 중에 발급되어 워커 메모리에만 있는 토큰
+        return await self.fallback.contains(token)
+
+
+def create_token_store() -> TokenStore:
+    """config.yaml의 token_store 설정(redis, memory)에 맞는 저장소 생성"""
+    memory_store = MemoryTokenStore(
+        settings.token_bloom_capacity, settings.token_bloom_error_rate
+    )
+    if settings.token_store == "memory":
+        return memory_store
+    return RedisTokenStore(redis, fallback=memory_store)
+
+
+token_store = create_token_store()